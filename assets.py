@@ -0,0 +1,161 @@
+import os
+import json
+import shutil
+import hashlib
+import argparse
+
+import pygame
+
+# Source artwork, and the directory that built assets and their manifest go in
+SOURCE_DIR = "images"
+BUILD_DIR = "assets"
+MANIFEST = "manifest.json"
+
+# Images used by the game, keyed by the name the game refers to them by, along with
+# their source artwork and the size they are displayed at, or `None` to keep their
+# original size. Artwork that isn't listed here isn't shipped in builds.
+IMAGES = {
+    "player": ("skydiver.png", None),
+    "player_sprite": ("skydiver.png", (100, 91)),
+    "mission": ("mission.png", (360, 91)),
+    "dynamic_o": ("dynamic-o.png", (75, 75)),
+    "highscore": ("highscore.png", None),
+    "heart_full": ("heart-full.png", (50, 50)),
+    "heart_empty": ("heart-empty.png", (50, 50)),
+    "cloud_a": ("cloud1.png", None),
+    "cloud_b": ("cloud2.png", None),
+    "cloud_c": ("cloud3.png", None),
+    "helicopter": ("helicopter.png", (100, 50)),
+    "explosion": ("explosion.png", None),
+}
+
+
+def _prepare(image, size):
+    """
+    Scale an image to the size it is displayed at, if needed.
+    """
+
+    if size is None or image.get_size() == tuple(size):
+        return image
+    return pygame.transform.scale(image, size)
+
+
+def load_images(resource):
+    """
+    Load every image used by the game, converted for fast blitting, keyed by name.
+    Built assets are used when their manifest matches `IMAGES` and the source
+    artwork, as they are already the size they are displayed at. Otherwise, such as when running from a source
+    checkout, the source artwork is loaded and scaled instead.
+    """
+
+    manifest_path = resource(os.path.join(BUILD_DIR, MANIFEST))
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+        if _manifest_matches(manifest, resource):
+            return {
+                name: pygame.image.load(
+                    resource(os.path.join(BUILD_DIR, entry["file"]))
+                ).convert_alpha()
+                for name, entry in manifest["images"].items()
+            }
+
+    images = {}
+    for name, (source, size) in IMAGES.items():
+        path = resource(os.path.join(SOURCE_DIR, source))
+        images[name] = _prepare(pygame.image.load(path).convert_alpha(), size)
+    return images
+
+
+def _hash_source(path):
+    """
+    SHA-256 digest of a source image, which the manifest records so that edited
+    artwork is noticed.
+    """
+
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _manifest_matches(manifest, resource):
+    """
+    Check that a manifest describes exactly the images in `IMAGES`, built from the
+    same source artwork at the same sizes, so that stale builds aren't loaded.
+    Builds that ship without the source artwork, such as the web build, can't be
+    checked against it, so only their sizes are checked.
+    """
+
+    images = manifest.get("images", {})
+    if images.keys() != IMAGES.keys():
+        return False
+
+    digests = {}
+    for name, (source, size) in IMAGES.items():
+        entry = images[name]
+        if entry.get("source") != source:
+            return False
+        if size is not None and entry.get("size") != list(size):
+            return False
+
+        path = resource(os.path.join(SOURCE_DIR, source))
+        if os.path.exists(path):
+            if source not in digests:
+                digests[source] = _hash_source(path)
+            if entry.get("sha256") != digests[source]:
+                return False
+    return True
+
+
+def build(output=BUILD_DIR):
+    """
+    Build the assets listed in `IMAGES` into the output directory, as 32-bit RGBA
+    images at the size they are displayed at, along with a manifest describing
+    them. Any previous build is replaced.
+    """
+
+    # Converting pixel formats requires a display, but not a visible one
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+
+    shutil.rmtree(output, ignore_errors=True)
+    os.makedirs(output)
+
+    manifest = {"images": {}}
+    for name, (source, size) in IMAGES.items():
+        path = os.path.join(SOURCE_DIR, source)
+        image = _prepare(pygame.image.load(path).convert_alpha(), size)
+
+        filename = f"{name}.png"
+        pygame.image.save(image, os.path.join(output, filename))
+        manifest["images"][name] = {
+            "file": filename,
+            "source": source,
+            "sha256": _hash_source(path),
+            "size": list(image.get_size()),
+        }
+
+    with open(os.path.join(output, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    pygame.display.quit()
+    return manifest
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Build display-ready images and a manifest for the game to load."
+    )
+    parser.add_argument(
+        "--output",
+        default=BUILD_DIR,
+        help=f"directory to write assets to (default: {BUILD_DIR})",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    manifest = build(args.output)
+    print(f"Built {len(manifest['images'])} images into {args.output}")
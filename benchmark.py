@@ -0,0 +1,185 @@
+import os
+import time
+import random
+import asyncio
+import argparse
+
+# The game must be imported headless, so configure the environment first
+os.environ["SKYFALL_HEADLESS"] = "1"
+
+import pygame  # noqa: E402
+
+import recording  # noqa: E402
+from main import game, GameView, VectorizedGameView  # noqa: E402
+
+# Stages of a `GameView` frame that are timed individually
+STAGES = [
+    "_steer",
+    "_populate_clouds_and_helis",
+    "_handle_cloud_movement",
+    "_handle_helicopter_movement",
+    "_cull_helicopters",
+    "draw",
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Run a headless GameView simulation and report its throughput."
+    )
+    parser.add_argument(
+        "--seconds",
+        type=float,
+        default=game.time_limit,
+        help="simulated seconds of gameplay (default: the full time limit)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=1954, help="seed for the random module"
+    )
+    parser.add_argument(
+        "--input",
+        choices=["idle", "sweep", "random"],
+        default="sweep",
+        help="scripted steering input to feed the player",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="PATH",
+        help="replay the first life of a recording instead of scripted input",
+    )
+    parser.add_argument(
+        "--store",
+        choices=["objects", "numpy"],
+        default="objects",
+        help="store obstacles as objects, or in the vectorized NumPy entity store",
+    )
+    parser.add_argument(
+        "--stress",
+        type=int,
+        default=0,
+        metavar="COUNT",
+        help="keep at least COUNT clouds and COUNT helicopters in play",
+    )
+    parser.add_argument(
+        "--no-render",
+        action="store_true",
+        help="skip drawing, and only measure the simulation",
+    )
+    return parser.parse_args()
+
+
+def scripted_inputs(pattern, frames):
+    """
+    Generate the steering direction for each frame of the scripted input pattern.
+    """
+
+    rng = random.Random(0)
+    direction = 0
+    for frame in range(frames):
+        if pattern == "sweep":
+            # Hold each direction for two seconds at a time
+            direction = -1 if (frame // 120) % 2 == 0 else 1
+        elif pattern == "random" and frame % 15 == 0:
+            direction = rng.choice([-1, 0, 1])
+        yield direction
+
+
+async def steer(view, previous, direction):
+    """
+    Feed key events to the view to move from one steering direction to another.
+    """
+
+    keys = {-1: pygame.K_LEFT, 1: pygame.K_RIGHT}
+    if previous in keys:
+        event = pygame.event.Event(pygame.KEYUP, key=keys[previous])
+        await view.handle_event(event)
+    if direction in keys:
+        event = pygame.event.Event(pygame.KEYDOWN, key=keys[direction])
+        await view.handle_event(event)
+
+
+def instrument(view, timings):
+    """
+    Wrap each stage of the view with a timer that accumulates into `timings`.
+    """
+
+    def timed(name, method):
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            result = await method(*args, **kwargs)
+            timings[name] += time.perf_counter() - start
+            return result
+
+        return wrapper
+
+    for name in STAGES:
+        setattr(view, name, timed(name, getattr(view, name)))
+
+
+async def run(args):
+    random.seed(args.seed)
+    game.render = not args.no_render
+    if args.replay:
+        game.replay = recording.Replay(args.replay)
+
+    view_class = VectorizedGameView if args.store == "numpy" else GameView
+    view = view_class(lives=game.total_lives)
+    view.running = True
+
+    timings = {name: 0.0 for name in STAGES}
+    instrument(view, timings)
+
+    frames = int(args.seconds / game.timestep)
+    peak_clouds = peak_helicopters = deaths = 0
+    previous = 0
+
+    start = time.perf_counter()
+    for direction in scripted_inputs(args.input, frames):
+        if direction != previous:
+            await steer(view, previous, direction)
+            previous = direction
+
+        # Top up the obstacles in stress mode, on top of the regular spawns
+        while len(view._clouds) < args.stress:
+            view._spawn_cloud(game.rng.spawns.randint(0, 2))
+        while len(view._helicopters) < args.stress:
+            view._spawn_helicopter()
+
+        await view.update(game.timestep)
+        if game.render:
+            await view.draw()
+
+        # Keep simulating through collisions, so that late-game density is reached,
+        # unless replaying, in which case the recorded life is over
+        if not view.running:
+            deaths += 1
+            if args.replay:
+                break
+            view.running = True
+
+        peak_clouds = max(peak_clouds, len(view._clouds))
+        peak_helicopters = max(peak_helicopters, len(view._helicopters))
+    elapsed = time.perf_counter() - start
+    frames = view._step
+
+    print(f"Simulated frames:    {frames}")
+    print(f"Wall time:           {elapsed:.3f} s")
+    print(f"Frames per second:   {frames / elapsed:.1f}")
+    print(f"Peak clouds:         {peak_clouds}")
+    print(f"Peak helicopters:    {peak_helicopters}")
+    print(f"Player collisions:   {deaths}")
+    print()
+    print(f"{'Stage':<30} {'Total (s)':>10} {'Per frame (ms)':>15} {'Share':>7}")
+    total = sum(timings.values()) or 1
+    for name in STAGES:
+        if name == "draw" and not game.render:
+            continue
+        print(
+            f"{name:<30} {timings[name]:>10.3f} "
+            f"{timings[name] / frames * 1000:>15.4f} {timings[name] / total:>7.1%}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
+    pygame.quit()
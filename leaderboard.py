@@ -2,6 +2,11 @@ import sqlite3
 from datetime import datetime
 import sys
 import os
+import time
+import atexit
+import queue
+import threading
+from concurrent.futures import Future
 
 # Database initialization
 base_path = getattr(sys, "_MEIPASS", os.path.abspath(".")).replace(
@@ -9,9 +14,90 @@ base_path = getattr(sys, "_MEIPASS", os.path.abspath(".")).replace(
 )
 DATABASE_FILE = os.path.join(base_path, "leaderboard.db")
 
+# How often, in seconds, to check whether the database has been changed by another
+# process (such as a results export) while the leaderboard is cached
+CACHE_CHECK_INTERVAL = 2.0
+
+# Number of prepared statements each connection keeps around for reuse. The queries
+# here are few, so this is headroom over sqlite3's default of 128, so that one-off
+# statements such as migrations never push the queries used every frame out.
+STATEMENT_CACHE_SIZE = 256
+
+# Pragmas applied to every connection. WAL journaling lets readers and the writer
+# work concurrently, and with `synchronous=NORMAL` commits no longer fsync on every
+# transaction, only on checkpoints.
+CONNECTION_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",
+    "PRAGMA busy_timeout=5000",
+]
+
+# In-memory cache of the top scores, which allows screens to read the leaderboard on
+# every frame without touching the database
+_cache = {
+    "entries": [],
+    "count": 0,
+    "valid": False,
+    "data_version": None,
+    "checked_at": 0,
+}
+
+# Queue of writes for the background writer thread, which is started on first use
+_writes = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+
+# Long-lived connections, one per thread, which are all closed at exit
+_local = threading.local()
+_connections = []
+_connections_lock = threading.Lock()
+
+
+# Function to get the long-lived database connection for the current thread,
+# opening and configuring it on first use
+def get_connection():
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        return conn
+
+    conn = sqlite3.connect(
+        DATABASE_FILE,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+
+    _local.conn = conn
+    with _connections_lock:
+        _connections.append(conn)
+    return conn
+
+
+# Function to close every open connection, which is called automatically at exit
+def close_connections():
+    with _connections_lock:
+        while _connections:
+            conn = _connections.pop()
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+    _local.__dict__.pop("conn", None)
+
+
+atexit.register(close_connections)
+
+
+# Function to mark the cached leaderboard as stale
+def invalidate_cache():
+    _cache["valid"] = False
+
 
 def initialize_database():
-    conn = sqlite3.connect(DATABASE_FILE)
+    conn = get_connection()
     c = conn.cursor()
 
     # Create players table if it doesn't exist
@@ -40,7 +126,161 @@ def initialize_database():
     )
 
     conn.commit()
-    conn.close()
+
+    # Bring older databases up to date with the current schema
+    migrate_database(conn)
+
+
+# Function to migrate the database schema to the latest version. The version is
+# stored in `PRAGMA user_version`, and each migration runs in its own transaction and
+# bumps it, so this is safe to run repeatedly against existing databases.
+def migrate_database(conn):
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+
+    for target, migration in enumerate(_MIGRATIONS, start=1):
+        if version >= target:
+            continue
+
+        conn.execute("BEGIN")
+        try:
+            for statement in migration:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {target}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
+        version = target
+
+    invalidate_cache()
+
+
+# Schema migrations, in order. Migration 1 moves each of the three scores of a
+# session into an indexed per-score table, kept in sync with `sessions` by triggers,
+# so that top-N and max-score queries are index lookups rather than full scans. It
+# also indexes the best score of each session, which is what results.sql reports.
+# Migration 2 prepares for merging sessions from other kiosks: sessions become unique
+# per player and start time, so that merges can be deduplicated, and each node that
+# is pulled from gets a high-water mark of the last session row merged from it.
+# Migration 3 gives each database a random ID, which is recorded with each node's
+# high-water mark, so that a node whose database has been replaced, such as by
+# reseeding it, is pulled from the start again rather than from a stale row ID.
+# Migration 4 keeps `scores` in sync when sessions are edited in place, such as to
+# correct a score or a player's email address, and rebuilds it in case any sessions
+# were edited before then.
+_MIGRATIONS = [
+    [
+        """
+        CREATE TABLE IF NOT EXISTS scores (
+            email TEXT NOT NULL,
+            session_start TIMESTAMP NOT NULL,
+            session_end TIMESTAMP NOT NULL,
+            life INTEGER NOT NULL,
+            score INTEGER NOT NULL,
+            PRIMARY KEY (email, session_start, life)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC)",
+        """
+        CREATE INDEX IF NOT EXISTS sessions_by_best_score
+        ON sessions (max(score1, score2, score3) DESC)
+        """,
+        """
+        INSERT OR IGNORE INTO scores (email, session_start, session_end, life, score)
+        SELECT email, session_start, session_end, 1, score1 FROM sessions
+        UNION ALL
+        SELECT email, session_start, session_end, 2, score2 FROM sessions
+        UNION ALL
+        SELECT email, session_start, session_end, 3, score3 FROM sessions
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS sessions_insert_scores
+        AFTER INSERT ON sessions
+        BEGIN
+            INSERT OR IGNORE INTO scores
+                (email, session_start, session_end, life, score)
+            VALUES
+                (NEW.email, NEW.session_start, NEW.session_end, 1, NEW.score1),
+                (NEW.email, NEW.session_start, NEW.session_end, 2, NEW.score2),
+                (NEW.email, NEW.session_start, NEW.session_end, 3, NEW.score3);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS sessions_delete_scores
+        AFTER DELETE ON sessions
+        BEGIN
+            DELETE FROM scores
+            WHERE email = OLD.email AND session_start = OLD.session_start;
+        END
+        """,
+    ],
+    [
+        """
+        DELETE FROM sessions WHERE rowid NOT IN (
+            SELECT min(rowid) FROM sessions GROUP BY email, session_start
+        )
+        """,
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS sessions_by_player
+        ON sessions (email, session_start)
+        """,
+        # Removing duplicates also removed the scores of the sessions that were kept
+        """
+        INSERT OR IGNORE INTO scores (email, session_start, session_end, life, score)
+        SELECT email, session_start, session_end, 1, score1 FROM sessions
+        UNION ALL
+        SELECT email, session_start, session_end, 2, score2 FROM sessions
+        UNION ALL
+        SELECT email, session_start, session_end, 3, score3 FROM sessions
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS sync_nodes (
+            node TEXT PRIMARY KEY,
+            high_water INTEGER NOT NULL DEFAULT 0,
+            synced_at TIMESTAMP
+        )
+        """,
+    ],
+    [
+        """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        )
+        """,
+        """
+        INSERT OR IGNORE INTO meta (key, value)
+        VALUES ('database_id', lower(hex(randomblob(16))))
+        """,
+        "ALTER TABLE sync_nodes ADD COLUMN database_id TEXT",
+    ],
+    [
+        """
+        CREATE TRIGGER IF NOT EXISTS sessions_update_scores
+        AFTER UPDATE ON sessions
+        BEGIN
+            DELETE FROM scores
+            WHERE email = OLD.email AND session_start = OLD.session_start;
+            INSERT OR REPLACE INTO scores
+                (email, session_start, session_end, life, score)
+            VALUES
+                (NEW.email, NEW.session_start, NEW.session_end, 1, NEW.score1),
+                (NEW.email, NEW.session_start, NEW.session_end, 2, NEW.score2),
+                (NEW.email, NEW.session_start, NEW.session_end, 3, NEW.score3);
+        END
+        """,
+        "DELETE FROM scores",
+        """
+        INSERT INTO scores (email, session_start, session_end, life, score)
+        SELECT email, session_start, session_end, 1, score1 FROM sessions
+        UNION ALL
+        SELECT email, session_start, session_end, 2, score2 FROM sessions
+        UNION ALL
+        SELECT email, session_start, session_end, 3, score3 FROM sessions
+        """,
+    ],
+]
 
 
 # Initialize the database (create tables if they don't exist)
@@ -49,24 +289,40 @@ initialize_database()
 
 # Function to add a player if they don't already exist
 def add_player(email, name):
-    conn = sqlite3.connect(DATABASE_FILE)
-    c = conn.cursor()
+    conn = get_connection()
+    _insert_player(conn.cursor(), email, name)
+    conn.commit()
+    invalidate_cache()
+
+
+# Function to log a session with scores
+def log_session(email, session_start, session_end, scores):
+    conn = get_connection()
+    _insert_session(conn.cursor(), email, session_start, session_end, scores)
+    conn.commit()
+    invalidate_cache()
+
+
+# Function to register a player, if needed, and log their session with scores in a
+# single transaction on the background writer thread. Returns a future which is
+# resolved once the session has been committed.
+def record_session_async(email, name, session_start, session_end, scores):
+    def record(c):
+        _insert_player(c, email, name)
+        _insert_session(c, email, session_start, session_end, scores)
 
+    return _submit_write(record)
+
+
+def _insert_player(c, email, name):
     # Check if the player already exists
     c.execute("SELECT * FROM players WHERE email = ?", (email,))
     if c.fetchone() is None:
         # Insert the player into the database
         c.execute("INSERT INTO players (email, name) VALUES (?, ?)", (email, name))
 
-    conn.commit()
-    conn.close()
-
-
-# Function to log a session with scores
-def log_session(email, session_start, session_end, scores):
-    conn = sqlite3.connect(DATABASE_FILE)
-    c = conn.cursor()
 
+def _insert_session(c, email, session_start, session_end, scores):
     # Insert the session into the database
     c.execute(
         """
@@ -76,19 +332,175 @@ def log_session(email, session_start, session_end, scores):
         (session_start, session_end, email, scores[0], scores[1], scores[2]),
     )
 
-    conn.commit()
-    conn.close()
+
+# Function to queue a write for the background writer thread, starting the thread
+# if needed. The write is a function that accepts a cursor.
+def _submit_write(write):
+    global _writer
+
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(
+                target=_write_loop, name="leaderboard-writer", daemon=True
+            )
+            _writer.start()
+            atexit.register(_stop_writer)
+
+    future = Future()
+    _writes.put((write, future))
+    return future
+
+
+# Background writer loop. Any writes that queue up while a transaction is being
+# committed are batched together into the next transaction.
+def _write_loop():
+    while True:
+        batch = [_writes.get()]
+        while True:
+            try:
+                batch.append(_writes.get_nowait())
+            except queue.Empty:
+                break
+
+        stop = any(write is None for write, _ in batch)
+        batch = [(write, future) for write, future in batch if write is not None]
+
+        if batch:
+            _commit_batch(batch)
+        if stop:
+            return
+
+
+def _commit_batch(batch):
+    conn = get_connection()
+    c = conn.cursor()
+    try:
+        for write, _ in batch:
+            write(c)
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        for _, future in batch:
+            future.set_exception(e)
+        return
+
+    invalidate_cache()
+    for _, future in batch:
+        future.set_result(None)
+
+
+# Function to flush any queued writes and stop the writer thread, called at exit
+def _stop_writer():
+    _writes.put((None, None))
+    _writer.join()
+
+
+# Function to get sessions, along with the player's name, in the order they were
+# added to the database, after the supplied row ID. Each row starts with its row ID,
+# which other nodes use as a high-water mark when merging. A different connection
+# can be supplied to read from another database file.
+def export_sessions(after=0, count=500, conn=None):
+    c = (conn or get_connection()).cursor()
+
+    c.execute(
+        """
+        SELECT s.rowid, s.session_start, s.session_end, s.email, p.name,
+               s.score1, s.score2, s.score3
+        FROM sessions s
+        JOIN players p ON s.email = p.email
+        WHERE s.rowid > ?
+        ORDER BY s.rowid
+        LIMIT ?
+    """,
+        (after, count),
+    )
+
+    return c.fetchall()
+
+
+# Function to get the random ID of a database, along with the row ID of its last
+# session, which other nodes use to tell when the database has been replaced. The
+# ID is `None` for databases that predate it. A different connection can be
+# supplied to describe another database file.
+def describe_database(conn=None):
+    c = (conn or get_connection()).cursor()
+
+    try:
+        c.execute("SELECT value FROM meta WHERE key = 'database_id'")
+        result = c.fetchone()
+        database_id = result[0] if result else None
+    except sqlite3.OperationalError:
+        database_id = None
+
+    c.execute("SELECT coalesce(max(rowid), 0) FROM sessions")
+    return database_id, c.fetchone()[0]
+
+
+# Function to get the row ID of the last session merged from a node, along with the
+# ID of the node's database at the time
+def get_high_water(node):
+    conn = get_connection()
+    c = conn.cursor()
+
+    c.execute(
+        "SELECT high_water, database_id FROM sync_nodes WHERE node = ?", (node,)
+    )
+    result = c.fetchone()
+    return result if result else (0, None)
+
+
+# Function to merge sessions exported from another node's database, in a single
+# transaction, and move that node's high-water mark to the last of them. Sessions
+# that are already present, such as ones that have made their way back from another
+# node, are skipped. Returns the number of new sessions.
+def merge_sessions(node, rows, database_id=None):
+    if not rows:
+        return 0
+
+    conn = get_connection()
+    c = conn.cursor()
+    try:
+        c.executemany(
+            "INSERT OR IGNORE INTO players (email, name) VALUES (?, ?)",
+            {(row[3], row[4]) for row in rows},
+        )
+        c.executemany(
+            """
+            INSERT OR IGNORE INTO sessions
+                (session_start, session_end, email, score1, score2, score3)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """,
+            [(row[1], row[2], row[3], row[5], row[6], row[7]) for row in rows],
+        )
+        merged = c.rowcount
+        c.execute(
+            """
+            INSERT INTO sync_nodes (node, high_water, database_id, synced_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (node) DO UPDATE SET
+                high_water = excluded.high_water,
+                database_id = excluded.database_id,
+                synced_at = excluded.synced_at
+        """,
+            (node, max(row[0] for row in rows), database_id, datetime.now()),
+        )
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+
+    invalidate_cache()
+    return merged
 
 
 # Function to get the player's name by their email address
 def get_player_name(email):
-    conn = sqlite3.connect(DATABASE_FILE)
+    conn = get_connection()
     c = conn.cursor()
 
     # Get the player's name by their email
     c.execute("SELECT name FROM players WHERE email = ?", (email,))
     result = c.fetchone()
-    conn.close()
 
     if result:
         return result[0]  # Return the name
@@ -97,56 +509,72 @@ def get_player_name(email):
 
 # Function to check if a score is the top score
 def is_high_score(score):
-    conn = sqlite3.connect(DATABASE_FILE)
+    conn = get_connection()
     c = conn.cursor()
 
-    c.execute("select max(max(score1), max(score2), max(score3)) from sessions")
+    c.execute("SELECT max(score) FROM scores")
 
     # Fetch the results
     top_score = c.fetchone()[0]
     return top_score and score == top_score
 
 
-# Function to get the top N scores across all sessions
+# Function to get the rank of a score across all sessions, where 1 is the top score.
+# Tied scores share a rank. Uses a range count over the score index rather than
+# scanning the leaderboard.
+def get_rank(score):
+    conn = get_connection()
+    c = conn.cursor()
+
+    c.execute("SELECT count(*) FROM scores WHERE score > ?", (score,))
+    return c.fetchone()[0] + 1
+
+
+# Function to detect writes made to the database file by other connections or
+# processes, throttled to avoid touching the database on every frame
+def _database_changed():
+    now = time.monotonic()
+    if now - _cache["checked_at"] < CACHE_CHECK_INTERVAL:
+        return False
+    _cache["checked_at"] = now
+
+    # `data_version` changes whenever a different connection commits to the database
+    version = get_connection().execute("PRAGMA data_version").fetchone()[0]
+
+    changed = version != _cache["data_version"]
+    _cache["data_version"] = version
+    return changed
+
+
+# Function to get the top N scores across all sessions, served from an in-memory
+# cache that is refreshed only when the database has been written to
 def get_leaderboard(count=10):
-    conn = sqlite3.connect(DATABASE_FILE)
+    if _database_changed():
+        invalidate_cache()
+
+    if not _cache["valid"] or count > _cache["count"]:
+        _cache["entries"] = _query_leaderboard(max(count, _cache["count"]))
+        _cache["count"] = max(count, _cache["count"])
+        _cache["valid"] = True
+
+    return _cache["entries"][:count]
+
+
+# Function to query the top N scores across all sessions from the database
+def _query_leaderboard(count):
+    conn = get_connection()
     c = conn.cursor()
 
     # Query to get top N scores, allowing multiple scores from the same player
     c.execute(
         """
-        SELECT p.name, s.score1, s.score2, s.score3, s.session_end
-        FROM sessions s
-        JOIN players p ON s.email = p.email
-        ORDER BY
-            CASE
-                WHEN s.score1 >= s.score2 AND s.score1 >= s.score3 THEN s.score1
-                WHEN s.score2 >= s.score1 AND s.score2 >= s.score3 THEN s.score2
-                ELSE s.score3
-            END DESC
+        SELECT p.name, sc.score, sc.session_end
+        FROM scores sc
+        JOIN players p ON sc.email = p.email
+        ORDER BY sc.score DESC
         LIMIT ?
     """,
         (count,),
     )
 
-    # Fetch the results
-    rows = c.fetchall()
-
-    # Flatten the results, and keep only top 'count' number of scores
-    leaderboard_entries = []
-    for row in rows:
-        name = row[0]
-        scores = [row[1], row[2], row[3]]
-        session_end = row[4]
-
-        # Extract each score individually and add it to leaderboard_entries
-        for score in scores:
-            leaderboard_entries.append((name, score, session_end))
-
-    # Sort all the scores by the score value and keep top 'count' entries
-    leaderboard_entries = sorted(
-        leaderboard_entries, key=lambda x: x[1], reverse=True
-    )[:count]
-
-    conn.close()
-    return leaderboard_entries
+    return c.fetchall()
@@ -1,23 +1,69 @@
+import gc
 import os
 import re
 import sys
+import time
 import random
 import asyncio
+import types
+import warnings
 
 from datetime import datetime
 
 import pygame
 
+import assets
+import recording
+from profiler import Profiler, GCMonitor
+
 # Enable VSync for SDL renderer
 os.environ["SDL_RENDER_VSYNC"] = "1"
 os.environ["SDL_HINT_FRAMEBUFFER_ACCELERATION"] = "1"
 os.environ["SDL_HINT_VIDEO_HIGHDPI_DISABLED"] = "1"
 os.environ["SDL_HINT_TOUCH_MOUSE_EVENTS"] = "0"
 
+# When running headless (e.g. for benchmarks or CI), use SDL's dummy drivers so that
+# no window or audio device is required
+HEADLESS = os.environ.get("SKYFALL_HEADLESS") == "1"
+if HEADLESS:
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+# Events that carry player input
+INPUT_EVENTS = {pygame.KEYDOWN, pygame.KEYUP, pygame.FINGERDOWN, pygame.FINGERUP}
+
+# NumPy is optional, and only needed for the vectorized entity store, which is
+# enabled with `SKYFALL_ENTITY_STORE=numpy`
+try:
+    import numpy as np
+except ImportError:
+    np = None
+ENTITY_STORE = os.environ.get("SKYFALL_ENTITY_STORE", "objects")
+
+# Garbage collection is managed around gameplay, unless `SKYFALL_GC=default`, and
+# allocations can be traced for profiling with `SKYFALL_TRACEMALLOC=1`
+GC_MODE = os.environ.get("SKYFALL_GC", "managed")
+TRACE_ALLOCATIONS = os.environ.get("SKYFALL_TRACEMALLOC") == "1"
+
+# Input recording and deterministic replay, for repeatable performance runs
+RECORD_PATH = os.environ.get("SKYFALL_RECORD")
+REPLAY_PATH = os.environ.get("SKYFALL_REPLAY")
+
 # If running in browser as wasm, fake out the leaderboard
 BROWSER = True if sys.platform == "emscripten" else False
 if not BROWSER:
     import leaderboard
+    import sync
+
+    # Merge in sessions from other kiosks, listed as comma-separated database paths
+    # or sync server URLs, so the leaderboard shows the global top scores
+    SYNC_SOURCES = [
+        source.strip()
+        for source in os.environ.get("SKYFALL_SYNC", "").split(",")
+        if source.strip()
+    ]
+    if SYNC_SOURCES:
+        sync.start_background_sync(SYNC_SOURCES)
 
     os.environ["SDL_RENDER_DRIVER"] = "metal"
     os.environ["SDL_HINT_RENDER_SCALE_QUALITY"] = "2"
@@ -36,6 +82,22 @@ else:
     os.environ["SDL_HINT_RENDER_BATCHING"] = "1"
 
 
+class FixedClock:
+    """
+    Stand-in for `pygame.time.Clock` which reports the same amount of time passing
+    on every tick without waiting, so that runs are reproducible and unthrottled.
+    """
+
+    def __init__(self, timestep):
+        self._tick_ms = timestep * 1000
+
+    def tick(self, framerate=0):
+        return self._tick_ms
+
+    def get_fps(self):
+        return 1000 / self._tick_ms
+
+
 def resource(path):
     """
     Loads images and fonts from disk using a technique compatible with running the
@@ -65,18 +127,48 @@ class SkyfallGame:
     time_limit = 300
     fps = 60
 
-    def __init__(self):
+    # Gameplay is simulated in fixed steps, independently of the frame rate, and
+    # rendering can optionally be interpolated between the last two steps
+    timestep = 1 / 60
+    max_frame_time = 0.25
+    interpolate = True
+
+    # Frame timing overlay, toggled with F3, and refreshed every few frames. Timing
+    # stats can be dumped to disk with F4.
+    profiler_toggle_key = pygame.K_F3
+    profiler_dump_key = pygame.K_F4
+    profiler_refresh_frames = 30
+
+    # Threshold for full garbage collections while a life is in progress, which is
+    # high enough that they are postponed until the life is over
+    postponed_gc_threshold = 1_000_000
+
+    def __init__(self, headless=HEADLESS, clock=None):
         self._monkeypatch_pygame()
 
+        # When headless, the simulation runs as fast as the CPU allows, advancing
+        # one fixed step per frame, and drawing can be skipped entirely
+        self.headless = headless
+        self.render = True
+
+        # Optionally manage garbage collection, to avoid pauses during gameplay
+        self.manage_gc = GC_MODE == "managed"
+        self._gc_thresholds = gc.get_threshold()
+
         pygame.init()
         pygame.font.init()
 
-        # Create a base surface with the original game size and the true screen
-        self.screen = pygame.Surface((self.screen_width, self.screen_height))
-        self._screen = pygame.display.set_mode(
-            (self.screen_width, self.screen_height),
-            pygame.DOUBLEBUF | pygame.SCALED | pygame.RESIZABLE,
-        )
+        # Create the true screen, and the surface that views draw into at the original
+        # game size. With SDL's renderer, the display surface already has the game
+        # size, so views draw straight into it. Otherwise, they draw into a base
+        # surface that is scaled into the window.
+        self._screen = self._create_display()
+        if self.presentation == "renderer":
+            self.screen = self._screen
+        else:
+            self.screen = pygame.Surface(
+                (self.screen_width, self.screen_height)
+            ).convert()
 
         # Restrict the events to process
         pygame.event.set_allowed(
@@ -86,32 +178,104 @@ class SkyfallGame:
                 pygame.KEYUP,
                 pygame.FINGERDOWN,
                 pygame.FINGERUP,
+                pygame.VIDEORESIZE,
             ]
         )
 
         # Track window size
         self.window_width = self.screen_width
         self.window_height = self.screen_height
+        self.calculate_scaled_size()
 
         # Set title and complete initialization
         pygame.display.set_caption("Skyfall")
 
+        self._font_registry = {}
+        self._image_variants = {}
         self.fonts = self._load_fonts()
         self.images = self._load_images()
         self.colors = self._create_colors()
-
-        self.clock = pygame.time.Clock()
+        self._derive_images()
+        self.rng = self._create_rngs()
+
+        # Fonts and images live for the whole game, so keep collections from
+        # scanning them
+        if self.manage_gc:
+            gc.freeze()
+
+        # Optionally record input for each life, or replay a previous recording
+        self.recorder = recording.Recorder(RECORD_PATH) if RECORD_PATH else None
+        self.replay = recording.Replay(REPLAY_PATH) if REPLAY_PATH else None
+
+        # The clock can be injected, and headless runs use a fixed clock
+        if clock is None:
+            clock = FixedClock(self.timestep) if headless else pygame.time.Clock()
+        self.clock = clock
         self.delta_time = self.clock.tick(self.fps) / 1000
+        self.alpha = 1
+        self.presented_at = time.perf_counter()
+
+        # Per-stage frame timing, which can be displayed in an overlay
+        self.profiler = Profiler()
+        self.show_profiler = False
+        self.screen_damaged = True
+        self._profiler_overlay = None
+        self._profiler_frames = 0
+
+        # Garbage collection pauses and per-frame allocations, reported through the
+        # profiler
+        self.gc_monitor = GCMonitor(self.profiler, TRACE_ALLOCATIONS)
+        self.gc_monitor.start()
+
+        # The view that is currently running, and the next scene to switch to
+        self.active_view = None
+        self._next_scene = None
+
+    def _create_display(self):
+        """
+        Create the window. Where possible, SDL's renderer scales and letterboxes the
+        game to fit the window (the "renderer" presentation path). Otherwise, each
+        frame is scaled in software into a preallocated surface (the "software"
+        presentation path). The active path is available as `presentation`.
+        """
+
+        size = (self.screen_width, self.screen_height)
+        try:
+            # pygame doesn't report SCALED in the display's flags, but warns when it
+            # has to fall back to scaling without an SDL renderer
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                display = pygame.display.set_mode(
+                    size, pygame.DOUBLEBUF | pygame.SCALED | pygame.RESIZABLE
+                )
+            if not any("no fast renderer" in str(w.message) for w in caught):
+                self.presentation = "renderer"
+                return display
+        except pygame.error:
+            pass
+
+        self.presentation = "software"
+        return pygame.display.set_mode(size, pygame.RESIZABLE)
 
     def handle_rescale(self, width, height):
+        # SDL's renderer takes care of fitting the game to the resized window
+        if self.presentation == "renderer":
+            return
+
         self.window_width = max(width, self.screen_width - 400)
         self.window_height = max(height, self.screen_height - 400)
-        pygame.display.set_mode(
+        self._screen = pygame.display.set_mode(
             (self.window_width, self.window_height), pygame.RESIZABLE
         )
         self.calculate_scaled_size()
 
     def calculate_scaled_size(self):
+        """
+        Calculate the size and letterbox offsets of the game within the window, and
+        preallocate the surface that frames are scaled into. Only needed for the
+        software presentation path, and only when the window changes size.
+        """
+
         aspect_ratio = self.screen_width / self.screen_height
         window_aspect_ratio = self.window_width / self.window_height
 
@@ -122,19 +286,157 @@ class SkyfallGame:
             self.scaled_width = self.window_width
             self.scaled_height = int(self.scaled_width / aspect_ratio)
 
+        self._scaled_offset = (
+            (self.window_width - self.scaled_width) // 2,
+            (self.window_height - self.scaled_height) // 2,
+        )
+
+        # No scaling is needed when the window matches the game size
+        if (self.scaled_width, self.scaled_height) == self.screen.get_size():
+            self._scaled_screen = None
+        else:
+            self._scaled_screen = pygame.Surface(
+                (self.scaled_width, self.scaled_height)
+            ).convert()
+
+        # Letterbox bars only need to be cleared after a resize, once per buffer
+        self._letterbox_frames = 2
+
     def update_display(self):
-        scaled = pygame.transform.scale(
-            self.screen, (self.scaled_width, self.scaled_height)
+        if self.headless:
+            self.presented_at = time.perf_counter()
+            self.delta_time = self.clock.tick(self.fps) / 1000
+            return
+
+        if self.show_profiler:
+            self.draw_profiler_overlay()
+
+        # With SDL's renderer, views have drawn straight into the display surface
+        if self.presentation == "software":
+            with self.profiler.measure("display.scale"):
+                scaled = self.screen
+                if self._scaled_screen is not None:
+                    pygame.transform.scale(
+                        self.screen,
+                        (self.scaled_width, self.scaled_height),
+                        self._scaled_screen,
+                    )
+                    scaled = self._scaled_screen
+
+            with self.profiler.measure("display.blit"):
+                if self._letterbox_frames:
+                    self._screen.fill(self.colors.black)
+                    self._letterbox_frames -= 1
+                self._screen.blit(scaled, self._scaled_offset)
+
+        with self.profiler.measure("display.flip"):
+            pygame.display.flip()
+        self.presented_at = time.perf_counter()
+
+        with self.profiler.measure("tick"):
+            self.delta_time = self.clock.tick(self.fps) / 1000
+
+    def draw_profiler_overlay(self):
+        """
+        Draw the per-stage frame timing stats in the bottom left of the screen. The
+        overlay is only re-rendered every few frames to keep its own cost down.
+        """
+
+        self._profiler_frames += 1
+        if (
+            self._profiler_overlay is None
+            or self._profiler_frames >= self.profiler_refresh_frames
+        ):
+            self._profiler_frames = 0
+            self._profiler_overlay = self._render_profiler_overlay()
+
+        self.screen.blit(
+            self._profiler_overlay,
+            (10, self.screen_height - self._profiler_overlay.get_height() - 10),
         )
 
-        offset_x = (self.window_width - self.scaled_width) // 2
-        offset_y = (self.window_height - self.scaled_height) // 2
+        # Views that only redraw dirty regions need to repaint over the overlay
+        self.screen_damaged = True
 
-        self._screen.fill(self.colors.black)
-        self._screen.blit(scaled, (offset_x, offset_y))
+    def _render_profiler_overlay(self):
+        """
+        Render the profiler stats into a semi-transparent surface.
+        """
 
-        pygame.display.flip()
-        self.delta_time = self.clock.tick(self.fps) / 1000
+        font = self.fonts.hud
+        line_height = font.get_linesize()
+        columns = [("stage", 10), ("p50", 230), ("p95", 310), ("p99", 390)]
+
+        stats = sorted(self.profiler.stats().items()) + sorted(
+            self.profiler.count_stats().items()
+        )
+        overlay = pygame.Surface((470, (len(stats) + 2) * line_height + 20))
+        overlay.set_alpha(200)
+        overlay.fill(self.colors.black)
+
+        # Report the active presentation path above the stats
+        text = font.render(
+            f"presentation: {self.presentation}", True, self.colors.orange
+        )
+        overlay.blit(text, (10, 10))
+
+        for column, x in columns:
+            text = font.render(column, True, self.colors.orange)
+            overlay.blit(text, (x, 10 + line_height))
+
+        for row, (name, stage) in enumerate(stats, start=2):
+            y = 10 + row * line_height
+            overlay.blit(font.render(name, True, self.colors.white), (10, y))
+            for column, x in columns[1:]:
+                value = f"{stage[column]:.2f}"
+                overlay.blit(font.render(value, True, self.colors.white), (x, y))
+
+        return overlay
+
+    def dump_profile(self, path=None):
+        """
+        Write the profiler's frame timing stats to disk, returning the path used.
+        """
+
+        if path is None:
+            path = f"skyfall-profile-{datetime.now():%Y%m%d-%H%M%S}.json"
+        self.profiler.dump(
+            path, {"allocation_sites": self.gc_monitor.allocation_sites()}
+        )
+        return path
+
+    def collect_garbage(self, freeze=False):
+        """
+        Run a full garbage collection between views, where the pause isn't noticed,
+        optionally freezing every object that survives so that later collections
+        don't scan them. The clock is restarted so that the pause isn't simulated.
+        """
+
+        if not self.manage_gc:
+            return
+
+        gc.collect()
+        if freeze:
+            gc.freeze()
+        self.clock.tick()
+
+    def postpone_full_collections(self):
+        """
+        Postpone full garbage collections, which are the ones that cause noticeable
+        pauses, leaving the cheaper collections of young objects running.
+        """
+
+        if self.manage_gc:
+            threshold0, threshold1, _ = self._gc_thresholds
+            gc.set_threshold(threshold0, threshold1, self.postponed_gc_threshold)
+
+    def resume_full_collections(self):
+        """
+        Restore the normal schedule of full garbage collections.
+        """
+
+        if self.manage_gc:
+            gc.set_threshold(*self._gc_thresholds)
 
     #
     # Initialization methods
@@ -152,6 +454,28 @@ class SkyfallGame:
 
         return colors
 
+    def _create_rngs(self):
+        """
+        Independent random number generators for each subsystem, so that gameplay
+        can be reproduced from a single seed with `seed_rngs`.
+        """
+
+        class rngs:
+            spawns = random.Random()
+            obstacles = random.Random()
+            scenery = random.Random()
+
+        return rngs
+
+    def seed_rngs(self, seed):
+        """
+        Seed the gameplay random number generators. Each subsystem derives its own
+        stream from the seed, so they don't perturb each other.
+        """
+
+        self.rng.spawns.seed(f"{seed}/spawns")
+        self.rng.obstacles.seed(f"{seed}/obstacles")
+
     def _monkeypatch_pygame(self):
         """
         For reasons I don't fully understand, pygame crashbombs when used with
@@ -170,57 +494,95 @@ class SkyfallGame:
         Collection of standard fonts used throughout the game.
         """
 
+        get_font = self.get_font
+
         class fonts:
-            title = pygame.font.Font(resource("fonts/title.ttf"), 144)
-            leaderboard_title = pygame.font.Font(resource("fonts/title.ttf"), 50)
-            hud = pygame.font.Font(resource("fonts/common.otf"), 20)
-            common = pygame.font.Font(resource("fonts/common.otf"), 36)
-            small_common = pygame.font.Font(
-                resource("fonts/common.otf"), int(36 * 0.75)
-            )
-            inputs = pygame.font.Font(resource("fonts/common.otf"), int(36 * 0.75))
-            errors = pygame.font.Font(resource("fonts/common.otf"), int(36 * 0.6))
+            title = get_font("fonts/title.ttf", 144)
+            leaderboard_title = get_font("fonts/title.ttf", 50)
+            hud = get_font("fonts/common.otf", 20)
+            common = get_font("fonts/common.otf", 36)
+            small_common = get_font("fonts/common.otf", int(36 * 0.75))
+            inputs = get_font("fonts/common.otf", int(36 * 0.75))
+            errors = get_font("fonts/common.otf", int(36 * 0.6))
 
         return fonts
 
     def _load_images(self):
         """
-        Collection of standard images used throughout the game
-        """
-
-        class images:
-            player = pygame.image.load(resource("images/skydiver.png")).convert_alpha()
-            mission = pygame.image.load(resource("images/mission.png")).convert_alpha()
-            dynamic_o = pygame.image.load(
-                resource("images/dynamic-o.png")
-            ).convert_alpha()
-            highscore = pygame.image.load(
-                resource("images/highscore.png")
-            ).convert_alpha()
-            heart_full = pygame.transform.scale(
-                pygame.image.load(resource("images/heart-full.png")).convert_alpha(),
-                (50, 50),
-            )
-            heart_empty = pygame.transform.scale(
-                pygame.image.load(resource("images/heart-empty.png")).convert_alpha(),
-                (50, 50),
-            )
-            cloud_a = pygame.image.load(resource("images/cloud1.png")).convert_alpha()
-            cloud_b = pygame.image.load(resource("images/cloud2.png")).convert_alpha()
-            cloud_c = pygame.image.load(resource("images/cloud3.png")).convert_alpha()
-            helicopter = pygame.transform.scale(
-                pygame.image.load(resource("images/helicopter.png")).convert_alpha(),
-                (100, 50),  # size of helicopter
-            )
-            explosion = pygame.image.load(
-                resource("images/explosion.png")
-            ).convert_alpha()
+        Collection of standard images used throughout the game, already sized for
+        display. See `assets.IMAGES`.
+        """
 
-        return images
+        return types.SimpleNamespace(**assets.load_images(resource))
+
+    def _derive_images(self):
+        """
+        Pre-compute the flipped variants of images that are used throughout the
+        game, so that no transforms happen while drawing. Scaling happens when
+        assets are built.
+        """
+
+        self.image_variant("helicopter", flip_x=True)
 
     #
     # Utility methods
     #
+    def image_variant(
+        self, name, scale=None, size=None, angle=0, flip_x=False, alpha=None
+    ):
+        """
+        Fetch a transformed variant of one of the standard images, keyed by the
+        transform applied. Variants are generated the first time they are requested,
+        and most are pre-computed at load time by `_derive_images`.
+        """
+
+        key = (name, scale, size, angle, flip_x, alpha)
+        image = self._image_variants.get(key)
+        if image is not None:
+            return image
+
+        image = getattr(self.images, name)
+        if scale is not None:
+            size = (int(image.get_width() * scale), int(image.get_height() * scale))
+        if size is not None:
+            image = pygame.transform.scale(image, size)
+        if flip_x:
+            image = pygame.transform.flip(image, True, False)
+        if angle:
+            image = pygame.transform.rotate(image, angle)
+        if alpha is not None:
+            image = image.copy()
+            image.set_alpha(alpha)
+
+        self._image_variants[key] = image
+        return image
+
+    def get_font(self, path, size):
+        """
+        Fetch a font from the shared font registry, keyed by path and size. Fonts
+        are only loaded from disk the first time a given combination is requested.
+        """
+
+        key = (path, size)
+        font = self._font_registry.get(key)
+        if font is None:
+            font = self._font_registry[key] = pygame.font.Font(resource(path), size)
+        return font
+
+    def interpolate_rect(self, rect, previous):
+        """
+        Position a copy of a rect between its previous and current simulated
+        positions, based upon how far rendering has progressed between the last two
+        simulation steps.
+        """
+
+        if self.alpha >= 1:
+            return rect
+
+        x = previous[0] + (rect.x - previous[0]) * self.alpha
+        y = previous[1] + (rect.y - previous[1]) * self.alpha
+        return rect.move(round(x - rect.x), round(y - rect.y))
+
     async def render_text(self, text, font, color, center_x, center_y):
         """
         Render text using a specific font, color, and central position.
@@ -234,6 +596,34 @@ class SkyfallGame:
     # View methods
     #
 
+    async def run(self):
+        """
+        Main loop of the game, which runs one scene at a time. Scenes request the
+        next scene with `change_scene` rather than calling into each other, so that
+        each scene, and its view, is released before the next one starts. When no
+        scene is requested, the game returns to the title screen.
+        """
+
+        # Everything created while starting up, such as the artwork prepared by
+        # entity classes, lives for the whole game
+        self.collect_garbage(freeze=True)
+
+        while True:
+            scene, args = self._next_scene or (self.show_title, ())
+            self._next_scene = None
+            await scene(*args)
+
+    async def change_scene(self, scene, *args):
+        """
+        Request that the game switch to another scene, which is one of the `show_*`
+        or `play` methods, and stop the active view so that the switch happens
+        immediately.
+        """
+
+        self._next_scene = (scene, args)
+        if self.active_view is not None:
+            await self.active_view.stop()
+
     async def show_title(self):
         """
         Show the "title screen" for the game.
@@ -254,7 +644,8 @@ class SkyfallGame:
         Show the "game screen" for the game itself.
         """
 
-        return await GameView(lives=lives).run()
+        view_class = VectorizedGameView if ENTITY_STORE == "numpy" else GameView
+        return await view_class(lives=lives).run()
 
     async def show_end_of_life(self, score, time_survived, cloud_points, max_speed):
         """
@@ -281,9 +672,6 @@ class SkyfallGame:
         lives = game.total_lives
 
         if not BROWSER:
-            # Check if the player exists, and register them if not
-            leaderboard.add_player(email, name)
-
             # Log the start of a new session
             session_start = datetime.now()
 
@@ -293,14 +681,21 @@ class SkyfallGame:
             session = await self.show_game(lives)
             score, time_survived, cloud_points, max_speed = await session.get_results()
             scores.append(score)
+            lives -= 1
+
+            if lives == 0 and not BROWSER:
+                # Register the player, if needed, and log the session in the
+                # background while the end-of-life screen is showing
+                session_end = datetime.now()
+                logged = leaderboard.record_session_async(
+                    email, name, session_start, session_end, scores
+                )
 
             await self.show_end_of_life(score, time_survived, cloud_points, max_speed)
-            lives -= 1
 
         if not BROWSER:
-            # Log the session at the end
-            session_end = datetime.now()
-            leaderboard.log_session(email, session_start, session_end, scores)
+            # The end of round screen ranks the session, so it must be committed
+            await asyncio.wrap_future(logged)
 
         # Display an end of round screen before returning to the title screen
         await self.show_end_of_round(scores, name, email)
@@ -321,21 +716,22 @@ class View:
     shared utility methods, and orchestrates the main loop and event loop.
     """
 
-    async def display_brand_symbol(self):
+    # Whether to postpone full garbage collections while the view is running
+    postpone_gc = False
+
+    async def display_brand_symbol(self, surface=None):
         """
-        Render the Mission "Dynamic O" mark in the bottom right of the screen
+        Render the Mission "Dynamic O" mark in the bottom right of the screen, or of
+        the supplied surface, returning the region it covers
         """
 
-        dynamic_o_scaled = pygame.transform.scale(
-            game.images.dynamic_o,
-            (
-                int(game.images.dynamic_o.get_width() * 0.15),
-                int(game.images.dynamic_o.get_height() * 0.15),
-            ),
-        )
+        if surface is None:
+            surface = game.screen
+
+        dynamic_o_scaled = game.images.dynamic_o
         symbol_x = game.screen_width - dynamic_o_scaled.get_width() - 20
         symbol_y = game.screen_height - dynamic_o_scaled.get_height() - 20
-        game.screen.blit(dynamic_o_scaled, (symbol_x, symbol_y))
+        return surface.blit(dynamic_o_scaled, (symbol_x, symbol_y))
 
     async def draw(self):
         """
@@ -346,6 +742,14 @@ class View:
 
         raise NotImplementedError()
 
+    async def update(self, delta_time):
+        """
+        Subclasses of `View` may provide an `update` method, which advances their
+        simulation by `delta_time` seconds. It is called zero or more times per
+        iteration of the main loop with a fixed `delta_time`, so that gameplay
+        doesn't depend on how often the view is drawn.
+        """
+
     async def handle_event(self, event):
         """
         Subclasses of `View` must provide a `handle_event` method, which will be
@@ -362,6 +766,39 @@ class View:
 
         self.running = False
 
+    async def _handle_events(self):
+        """
+        Drain the pygame event queue, handling global shortcuts and passing the
+        remaining events on to the view. Returns the time at which input events
+        were read, if there were any.
+        """
+
+        read_at = time.perf_counter()
+        input_time = None
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+
+            if event.type == pygame.VIDEORESIZE:
+                game.handle_rescale(event.w, event.h)
+
+            # Handle profiler shortcuts before the view sees them
+            if event.type == pygame.KEYDOWN:
+                if event.key == game.profiler_toggle_key:
+                    game.show_profiler = not game.show_profiler
+                    continue
+                if event.key == game.profiler_dump_key:
+                    game.dump_profile()
+                    continue
+
+            if event.type in INPUT_EVENTS:
+                input_time = read_at
+
+            await self.handle_event(event)
+
+        return input_time
+
     async def run(self):
         """
         Main run loop and event loop for the view. Handles the coordination of view
@@ -371,31 +808,54 @@ class View:
         """
 
         self.running = True
-        frame_count = 0
+        game.active_view = self
+        if self.postpone_gc:
+            game.postpone_full_collections()
+        accumulator = 0
+        profiler = game.profiler
+        frame_start = time.perf_counter()
         while self.running:
-            frame_count += 1
+            # Drain and handle every pending event before simulating, so that input
+            # takes effect on the very next frame
+            with profiler.measure("events"):
+                input_time = await self._handle_events()
+
+            # Advance the simulation in fixed steps to catch up with the time that
+            # has elapsed, dropping time if rendering has stalled for too long
+            with profiler.measure("simulation"):
+                accumulator += min(game.delta_time, game.max_frame_time)
+                while accumulator >= game.timestep and self.running:
+                    await self.update(game.timestep)
+                    accumulator -= game.timestep
+
+            # Track how far rendering is between simulation steps
+            game.alpha = accumulator / game.timestep if game.interpolate else 1
 
             # Call the subclass' `draw` method to paint the screen
-            await self.draw()
-
-            # Handle events from pygame
-            if frame_count % 2 == 0:
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        sys.exit()
-
-                    if event.type == pygame.VIDEORESIZE:
-                        game.handle_rescale(event.w, event.h)
-
-                    await self.handle_event(event)
-
-                pygame.event.pump()
+            if game.render:
+                with profiler.measure("draw"):
+                    await self.draw()
 
             # Tell pygame to update the display, and yield to other tasks
             game.update_display()
             await asyncio.sleep(0)
 
+            # Track the latency from reading input to presenting the frame with it
+            if input_time is not None:
+                profiler.record("input.latency", game.presented_at - input_time)
+
+            now = time.perf_counter()
+            profiler.record("frame", now - frame_start)
+            game.gc_monitor.end_frame()
+            frame_start = now
+
+        if game.active_view is self:
+            game.active_view = None
+
+        # Catch up on garbage collection before the next view starts
+        if self.postpone_gc:
+            game.resume_full_collections()
+        game.collect_garbage()
         return self
 
 
@@ -414,6 +874,7 @@ class TitleView(View):
         self._blink_timer = 0
         self._blink_interval = 3000
         self._background_clouds = []
+        self._frame = FrameTime()
         self._populate_clouds()
         self._leaderboard = Leaderboard()
 
@@ -425,11 +886,11 @@ class TitleView(View):
 
         # If the user presses 'Return', go to session info screen
         if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
-            await game.show_session_info()
+            await game.change_scene(game.show_session_info)
 
         # If the user is on mobile and taps the screen, go to session into screen
         elif BROWSER and event.type == pygame.FINGERUP:
-            await game.show_session_info()
+            await game.change_scene(game.show_session_info)
             return
 
     async def draw(self):
@@ -457,13 +918,7 @@ class TitleView(View):
         Draw the Mission logo and a message that the game was built by Mission.
         """
 
-        mission_scaled = pygame.transform.scale(
-            game.images.mission,
-            (
-                int(game.images.mission.get_width() * 0.45),
-                int(game.images.mission.get_height() * 0.45),
-            ),
-        )
+        mission_scaled = game.images.mission
 
         await game.render_text(
             "BROUGHT TO YOU BY",
@@ -528,8 +983,8 @@ class TitleView(View):
         """
 
         for _ in range(5):
-            cloud_type = random.randint(0, 2)
-            cloud_speed = random.uniform(50, 150)
+            cloud_type = game.rng.scenery.randint(0, 2)
+            cloud_speed = game.rng.scenery.uniform(50, 150)
             self._background_clouds.append(BackgroundCloud(cloud_type, cloud_speed))
 
     async def _draw_clouds(self):
@@ -538,18 +993,19 @@ class TitleView(View):
         the screen.
         """
 
-        # Move and draw background clouds
-        for cloud in self._background_clouds[:]:
-            cloud.move(game.delta_time)
-            cloud.draw()
+        # Move background clouds, and draw them in a single batch
+        self._frame.advance(game.delta_time)
+        for cloud in self._background_clouds:
+            cloud.move(self._frame)
+        game.screen.fblits([cloud.blit_args() for cloud in self._background_clouds])
 
-            # Remove cloud once it goes off-screen and add a new one
+        # Remove clouds once they go off-screen and add new ones
+        for index, cloud in enumerate(self._background_clouds):
             if cloud.rect.y + cloud.rect.height < 0:
-                self._background_clouds.remove(cloud)
-                cloud_type = random.randint(0, 2)
-                cloud_speed = random.uniform(50, 150)
-                self._background_clouds.append(
-                    BackgroundCloud(cloud_type, cloud_speed)
+                cloud_type = game.rng.scenery.randint(0, 2)
+                cloud_speed = game.rng.scenery.uniform(50, 150)
+                self._background_clouds[index] = BackgroundCloud(
+                    cloud_type, cloud_speed
                 )
 
 
@@ -649,7 +1105,7 @@ class SessionInfoView(View):
 
         # Don't bother collecting information if running in the browser
         if BROWSER:
-            await game.play()
+            await game.change_scene(game.play)
             return
 
         # Draw the sky backgro8und
@@ -679,7 +1135,7 @@ class SessionInfoView(View):
             return
 
         if event.key == pygame.K_ESCAPE:
-            await game.show_title()
+            await game.change_scene(game.show_title)
             return
 
         if event.key == pygame.K_BACKSPACE:
@@ -696,8 +1152,7 @@ class SessionInfoView(View):
                     self._error_message = "Name must be at least 4 characters."
             elif self._is_typing_email:
                 if self._is_valid_email(self._email) and len(self._email) >= 6:
-                    leaderboard.add_player(self._email, self._name)
-                    await game.play(self._name, self._email)
+                    await game.change_scene(game.play, self._name, self._email)
                     return
                 else:
                     self._error_message = "Please enter a valid email address."
@@ -798,6 +1253,9 @@ class EndOfRoundView(View):
         self._player_is_top = (
             None if BROWSER else leaderboard.is_high_score(self._best_score)
         )
+        self._player_rank = (
+            None if BROWSER else leaderboard.get_rank(self._best_score)
+        )
         self._leaderboard = Leaderboard(self._name, self._scores)
 
     async def _draw_header(self):
@@ -869,16 +1327,10 @@ class EndOfRoundView(View):
             return
 
         # Indicate the player's best score and ranking
-        top_scores = leaderboard.get_leaderboard(count=8)
-        player_rank = None
-        for i, (name, score, _) in enumerate(top_scores):
-            if (name == self._name) and (score == self._best_score):
-                player_rank = i + 1
-                break
-
-        if player_rank and not self._player_is_top:
+        if self._player_rank and not self._player_is_top:
             await game.render_text(
-                f"You are ranked {player_rank} with a score of {int(self._best_score)}",
+                f"You are ranked {self._player_rank} with a score of "
+                f"{int(self._best_score)}",
                 game.fonts.small_common,
                 game.colors.red,
                 game.screen_width // 2,
@@ -909,11 +1361,11 @@ class EndOfRoundView(View):
             sys.exit()
 
         if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
-            await game.show_title()
+            await game.change_scene(game.show_title)
             return
 
         if BROWSER and event.type == pygame.FINGERUP:
-            await game.show_title()
+            await game.change_scene(game.show_title)
             return
 
 
@@ -923,276 +1375,1023 @@ class GameView(View):
     life tracker, and branding.
     """
 
+    # Full garbage collections are postponed until the life is over
+    postpone_gc = True
+
+    # Size of the cells used for broad-phase collision detection, roughly the size
+    # of the largest obstacle
+    collision_cell_size = 128
+
+    # Size of the HUD in the top left of the screen
+    hud_width = 250
+    hud_height = 110
+
+    # Input events that are captured when recording, and their recorded kinds
+    recorded_events = {
+        pygame.KEYDOWN: recording.KEYDOWN,
+        pygame.KEYUP: recording.KEYUP,
+        pygame.FINGERDOWN: recording.FINGERDOWN,
+        pygame.FINGERUP: recording.FINGERUP,
+    }
+    replayed_events = {kind: event for event, kind in recorded_events.items()}
+
     def __init__(self, lives):
         super().__init__()
         self._lives = lives
         self._player = Player()
         self._clouds = []
         self._helicopters = []
+        self._cloud_pool = Pool(Cloud)
+        self._helicopter_pool = Pool(Helicopter)
+        self._helicopter_grid = SpatialHash(self.collision_cell_size)
         self._total_cloud_points = 0
         self._time_survived = 0
         self._obstacle_speed = 200
         self._max_speed = 200
-        self._start_time = pygame.time.get_ticks()
+        self._step = 0
+
+        # Simulation time, captured once per step and passed to entities
+        self._frame = FrameTime()
+
+        # Cached static layers, and the regions drawn during the previous frame
+        self._background = None
+        self._foreground = None
+        self._foreground_regions = []
+        self._dirty_rects = []
+        self._hud_text = {}
+
+        # State of the steering controls, for continuous key and touch steering
+        self._input = InputState()
+
+        # Seed gameplay from the next recorded life when replaying, and otherwise
+        # from a fresh seed, which is recorded if recording is enabled
+        self._replay = game.replay.next_life() if game.replay else None
+        seed = self._replay.seed if self._replay else random.randrange(2**31)
+        game.seed_rngs(seed)
+        if game.recorder:
+            game.recorder.start_life(seed, pygame.time.get_ticks())
+
+    async def _compose_layers(self):
+        """
+        Compose the static layers of the game view once: an opaque background with
+        the sky, and a transparent foreground with the HUD frame, the number of
+        lives, and the brand symbol, which is drawn over moving entities.
+        """
 
-        # Flags for tracking continuous touch steering
-        self._steer_left = False
-        self._steer_right = False
+        self._background = pygame.Surface(game.screen.get_size()).convert()
+        self._background.fill(game.colors.sky_blue)
+
+        self._foreground = pygame.Surface(
+            game.screen.get_size(), pygame.SRCALPHA
+        ).convert_alpha()
+        self._foreground_regions = [
+            await self._draw_hud_frame(self._foreground),
+            await self._draw_lives(self._foreground),
+            await self.display_brand_symbol(self._foreground),
+        ]
+
+    async def _draw_hud_frame(self, surface):
+        """
+        Draw the semi-transparent frame of the HUD, returning the region it covers.
+        """
+
+        hud_rect = pygame.Rect(10, 10, self.hud_width, self.hud_height)
+        surface.fill((0, 0, 0, 100), hud_rect)
+        pygame.draw.rect(surface, game.colors.black, hud_rect, 1)
+        return hud_rect
+
+    def _render_hud_text(self, text):
+        """
+        Render a line of HUD text, reusing the surface while the text is unchanged.
+        """
+
+        surface = self._hud_text.get(text)
+        if surface is None:
+            # Only the current line for each HUD slot is worth keeping
+            if len(self._hud_text) > 8:
+                self._hud_text.clear()
+            surface = self._hud_text[text] = game.fonts.hud.render(
+                text, True, game.colors.white
+            )
+        return surface
 
     async def _draw_hud(self):
         """
         Display a HUD in the top left of the screen showing how long they have
         survived, how many cloud points they've collected, and what their current
-        fall speed is.
+        fall speed is. Returns the region of the screen that the HUD covers.
         """
 
-        hud_width = 250
-        hud_height = 110
-
-        time_text = game.fonts.hud.render(
-            f"Time: {int(self._time_survived)} s", True, game.colors.white
-        )
-        cloud_text = game.fonts.hud.render(
-            f"Cloud Points: {self._total_cloud_points}", True, game.colors.white
+        time_text = self._render_hud_text(f"Time: {int(self._time_survived)} s")
+        cloud_text = self._render_hud_text(
+            f"Cloud Points: {self._total_cloud_points}"
         )
-        speed_text = game.fonts.hud.render(
-            f"Speed: {int(self._obstacle_speed)} ft/s", True, game.colors.white
+        speed_text = self._render_hud_text(
+            f"Speed: {int(self._obstacle_speed)} ft/s"
         )
-        hud_surface = pygame.Surface((hud_width, hud_height))
-        hud_surface.set_alpha(100)
-        hud_surface.fill(game.colors.black)
-        game.screen.blit(hud_surface, (10, 10))
 
-        pygame.draw.rect(
-            game.screen, game.colors.black, (10, 10, hud_width, hud_height), 1
+        line_height = time_text.get_height() + 4
+        game.screen.fblits(
+            [
+                (time_text, (20, 20)),
+                (cloud_text, (20, 20 + line_height)),
+                (speed_text, (20, 20 + 2 * line_height)),
+            ]
         )
 
-        game.screen.blit(time_text, (20, 20))
-        game.screen.blit(cloud_text, (20, 20 + time_text.get_height() + 4))
-        game.screen.blit(speed_text, (20, 20 + 2 * (time_text.get_height() + 4)))
+        return pygame.Rect(10, 10, self.hud_width, self.hud_height)
 
-    async def _steer(self):
+    async def _steer(self, delta_time):
         """
         Handle requests to steer to the left or right.
         """
 
-        if self._steer_left:
-            self._player.handle_movement({pygame.K_LEFT: True})
-        elif self._steer_right:
-            self._player.handle_movement({pygame.K_RIGHT: True})
+        if self._input.left:
+            self._player.move(-1, self._frame)
+        elif self._input.right:
+            self._player.move(1, self._frame)
         else:
-            self._player.handle_movement({})
+            self._player.move(0, self._frame)
 
     async def _populate_clouds_and_helis(self):
         """
         Add clouds and helicopters as needed, with random positions and speeds.
         """
 
-        if random.random() < 0.03:
-            cloud_type = random.randint(0, 2)
-            self._clouds.append(Cloud(cloud_type, self._obstacle_speed))
-        if random.random() < min((0.002 * self._time_survived), 0.02):
-            self._helicopters.append(Helicopter(self._obstacle_speed))
+        if game.rng.spawns.random() < 0.03:
+            self._spawn_cloud(game.rng.spawns.randint(0, 2))
+        if game.rng.spawns.random() < min((0.002 * self._time_survived), 0.02):
+            self._spawn_helicopter()
 
-    async def _handle_cloud_movement(self):
+    def _spawn_cloud(self, cloud_type):
         """
-        Move clouds and see if they have collided with the player.
+        Add a cloud of the supplied type at the bottom of the screen.
         """
 
-        for cloud in self._clouds[:]:
-            cloud.move(game.delta_time)
-            if self._player.rect.colliderect(cloud.rect):
+        self._clouds.append(self._cloud_pool.acquire(cloud_type, self._obstacle_speed))
+
+    def _spawn_helicopter(self):
+        """
+        Add a helicopter at the bottom of the screen.
+        """
+
+        self._helicopters.append(self._helicopter_pool.acquire(self._obstacle_speed))
+
+    async def _handle_cloud_movement(self, delta_time):
+        """
+        Move clouds and see if they have collided with the player. Clouds that are
+        collected or that leave the top of the screen are returned to the pool.
+        """
+
+        for cloud in self._clouds:
+            cloud.move(self._frame)
+
+        collected = set(self._player.rect.collidelistall(self._clouds))
+
+        remaining = []
+        for index, cloud in enumerate(self._clouds):
+            if index in collected:
                 self._total_cloud_points += cloud.point_value
-                self._clouds.remove(cloud)
+                self._cloud_pool.release(cloud)
+            elif cloud.expired:
+                self._cloud_pool.release(cloud)
+            else:
+                remaining.append(cloud)
+        self._clouds = remaining
+
+    async def _cull_helicopters(self):
+        """
+        Return helicopters that have left the top of the screen, or have finished
+        fading out after exploding, to the pool.
+        """
+
+        remaining = []
+        for heli in self._helicopters:
+            if heli.expired:
+                self._helicopter_pool.release(heli)
+            else:
+                remaining.append(heli)
+        self._helicopters = remaining
 
-    async def _handle_helicopter_movement(self):
+    async def _handle_helicopter_movement(self, delta_time):
         """
         Move helicopters and see if they have collided with either the player or
         with each other, causing them to explode.
         """
 
+        # Move helicopters, and index those that haven't exploded for collisions
+        self._helicopter_grid.clear()
+        flying = []
         for heli in self._helicopters:
-            if self._player.hitbox.colliderect(heli.rect) and not heli.exploded:
-                self._score = (10 * self._time_survived) + self._total_cloud_points
-                await self.stop()
-                return
+            heli.move(self._frame)
+            if not heli.exploded:
+                self._helicopter_grid.insert(heli)
+                flying.append(heli)
 
-            heli.move(game.delta_time)
-
-            if heli.exploded:
-                continue
+        # End the life if the player has flown into a helicopter
+        if self._player.hitbox.collidelist(flying) != -1:
+            self._score = (10 * self._time_survived) + self._total_cloud_points
+            await self.stop()
+            return
 
-        for other_heli in self._helicopters:
-            if (
-                other_heli != heli
-                and other_heli.rect.colliderect(heli.rect)
-                and not other_heli.exploded
-            ):
-                heli.exploded = True
-                other_heli.exploded = True
+        # Explode any helicopters that have collided with each other
+        for heli, other_heli in self._helicopter_grid.pairs():
+            heli.exploded = True
+            other_heli.exploded = True
 
-    async def _draw_lives(self):
+    async def _draw_lives(self, surface):
         """
-        Draw filled and empty hearts in the top right of the screen, indicating how
-        many lives the player has left.
+        Draw filled and empty hearts in the top right of the surface, indicating how
+        many lives the player has left. Returns the region the hearts cover.
         """
 
         padding = 20
+        region = None
         for i in range(game.total_lives):
             heart_x = game.screen_width - padding - (i * 60) - 50
             heart_image = (
                 game.images.heart_full if i < self._lives else game.images.heart_empty
             )
-            game.screen.blit(heart_image, (heart_x, 10))
+            rect = surface.blit(heart_image, (heart_x, 10))
+            region = rect if region is None else region.union(rect)
+        return region
 
-    async def draw(self):
+    async def update(self, delta_time):
         """
-        Draw the game view on each iteration of the main loop.
+        Advance the game simulation by one fixed step.
         """
 
         speed_increment = 15
 
-        self._time_survived = (pygame.time.get_ticks() - self._start_time) / 1000
+        # Feed recorded input that was handled before this step
+        if self._replay:
+            for kind, key, x, y in self._replay.events_for(self._step):
+                await self._handle_input(self._decode_event(kind, key, x, y))
+        self._step += 1
+
+        self._frame.advance(delta_time)
+        self._time_survived = self._frame.elapsed
 
         # Gradually increment speed
-        self._obstacle_speed += speed_increment * game.delta_time
+        self._obstacle_speed += speed_increment * delta_time
         self._max_speed = max(self._max_speed, self._obstacle_speed)
 
         # End the round if the player has exceeded the time limit
         if self._time_survived > game.time_limit:
             self._score = (10 * self._time_survived) + self._total_cloud_points
+            await self.stop()
             return
 
         # Handle steering
-        await self._steer()
+        await self._steer(delta_time)
 
         # Populate the number of clouds and helicopters on screen
         await self._populate_clouds_and_helis()
 
         # Move and check collisions for clouds and helis
-        await self._handle_cloud_movement()
-        await self._handle_helicopter_movement()
+        await self._handle_cloud_movement(delta_time)
+        await self._handle_helicopter_movement(delta_time)
+        await self._cull_helicopters()
 
-        # Draw the sky, the player, clouds, and helicopters
-        game.screen.fill(game.colors.sky_blue)
-        self._player.draw()
-        for cloud in self._clouds:
-            cloud.draw()
-        for helicopter in self._helicopters:
-            helicopter.draw()
+    async def draw(self):
+        """
+        Draw the game view on each iteration of the main loop.
+        """
 
-        # Draw the HUD and number of lives
-        await self._draw_hud()
-        await self._draw_lives()
+        profiler = game.profiler
+        screen = game.screen
 
-        # Show brand symbol (dynamic-o.png) in the bottom right
-        await self.display_brand_symbol()
+        # Restore the static background, either over the whole screen, or only over
+        # the regions that were drawn during the previous frame
+        with profiler.measure("draw.restore"):
+            if self._background is None:
+                await self._compose_layers()
+                game.screen_damaged = True
+            if game.screen_damaged:
+                screen.blit(self._background, (0, 0))
+                restored = [screen.get_rect()]
+                game.screen_damaged = False
+            else:
+                restored = self._dirty_rects
+                screen.blits(
+                    [(self._background, rect, rect) for rect in restored],
+                    doreturn=False,
+                )
+
+            # Restore the background under each static foreground region as a whole,
+            # so that the translucent foreground is blended exactly once per frame.
+            # The regions are small, and the HUD changes every frame anyway.
+            screen.blits(
+                [
+                    (self._background, region, region)
+                    for region in self._foreground_regions
+                ],
+                doreturn=False,
+            )
+
+        # Draw the player, clouds, and helicopters
+        dirty_rects = []
+        with profiler.measure("draw.player"):
+            dirty_rects.append(screen.blit(*self._player.blit_args()))
+        with profiler.measure("draw.clouds"):
+            dirty_rects.extend(self._draw_clouds())
+        with profiler.measure("draw.helicopters"):
+            dirty_rects.extend(self._draw_helicopters())
+
+        # Repaint the static foreground (HUD frame, lives, and brand symbol) over
+        # each of its regions, once
+        with profiler.measure("draw.foreground"):
+            screen.blits(
+                [
+                    (self._foreground, region, region)
+                    for region in self._foreground_regions
+                ],
+                doreturn=False,
+            )
+            dirty_rects.extend(self._foreground_regions)
+
+        # Draw the HUD text, which is redrawn every frame
+        with profiler.measure("draw.hud"):
+            dirty_rects.append(await self._draw_hud())
+
+        self._dirty_rects = dirty_rects
+
+    def _draw_clouds(self):
+        """
+        Draw the clouds in a single batch, returning the regions drawn.
+        """
+
+        return game.screen.blits([cloud.blit_args() for cloud in self._clouds])
+
+    def _draw_helicopters(self):
+        """
+        Draw the helicopters in a single batch, returning the regions drawn.
+        """
+
+        return game.screen.blits([heli.blit_args() for heli in self._helicopters])
 
     async def handle_event(self, event):
         """
-        Handle events as they come in from pygame, allowing the user to steer the
-        skydiver, either with a keyboard or with touch input if on mobile in a web
-        browser.
+        Handle events as they come in from pygame, recording them if enabled. Live
+        input is ignored while replaying a recording.
+        """
+
+        if self._replay:
+            return
+
+        if game.recorder and event.type in self.recorded_events:
+            game.recorder.record(
+                self._step, pygame.time.get_ticks(), *self._encode_event(event)
+            )
+
+        await self._handle_input(event)
+
+    def _encode_event(self, event):
+        """
+        Convert a pygame input event into its recorded kind and payload.
+        """
+
+        kind = self.recorded_events[event.type]
+        if event.type in (pygame.KEYDOWN, pygame.KEYUP):
+            return kind, event.key, 0, 0
+        return kind, 0, event.x, event.y
+
+    def _decode_event(self, kind, key, x, y):
+        """
+        Convert a recorded kind and payload back into a pygame input event.
+        """
+
+        event_type = self.replayed_events[kind]
+        if event_type in (pygame.KEYDOWN, pygame.KEYUP):
+            return pygame.event.Event(event_type, key=key)
+        return pygame.event.Event(event_type, x=x, y=y)
+
+    async def _handle_input(self, event):
+        """
+        Handle input events, allowing the user to steer the skydiver, either with a
+        keyboard or with touch input if on mobile in a web browser.
+        """
+
+        self._input.handle(event)
+
+    async def get_results(self):
+        """
+        Provide the results of the gaming session once it has concluded.
+        """
+
+        return (
+            round((10 * self._time_survived) + self._total_cloud_points),
+            round(self._time_survived),
+            round(self._total_cloud_points),
+            round(self._max_speed),
+        )
+
+
+class VectorizedGameView(GameView):
+    """
+    Game view which keeps clouds and helicopters in `EntityStore`s rather than as
+    individual objects, so that moving, culling, and colliding them are vectorized
+    passes. This scales to stress tests and batch simulations with thousands of
+    obstacles. Positions are kept as floats rather than whole pixels, so runs don't
+    exactly match `GameView` for the same seed.
+    """
+
+    def __init__(self, lives):
+        super().__init__(lives)
+        self._clouds = EntityStore()
+        self._helicopters = EntityStore()
+        self._cloud_points = np.array(
+            [cloud_type["points"] for cloud_type in Cloud.cloud_types]
+        )
+
+    def _spawn_cloud(self, cloud_type):
+        """
+        Add a cloud of the supplied type at the bottom of the screen, using the
+        random number generators in the same way as `Cloud.reset`.
+        """
+
+        width, height = Cloud.cloud_types[cloud_type]["image"].get_size()
+        self._clouds.spawn(
+            x=game.rng.obstacles.randint(0, game.screen_width - width),
+            y=game.screen_height,
+            width=width,
+            height=height,
+            speed=self._obstacle_speed,
+            kind=cloud_type,
+        )
+
+    def _spawn_helicopter(self):
+        """
+        Add a helicopter at the bottom of the screen, using the random number
+        generators in the same way as `Helicopter.reset`.
+        """
+
+        width, height = game.images.helicopter.get_size()
+        self._helicopters.spawn(
+            x=game.rng.obstacles.randint(0, game.screen_width - width),
+            y=game.screen_height,
+            width=width,
+            height=height,
+            speed=self._obstacle_speed,
+            turn_timer=1,
+            horizontal_speed=game.rng.obstacles.uniform(40, 120),
+            direction=game.rng.obstacles.choice([-1, 1]),
+            opacity=255,
+        )
+
+    async def _handle_cloud_movement(self, delta_time):
+        """
+        Move clouds and collect those that the player has collided with. Collected
+        clouds and those that leave the top of the screen are removed.
+        """
+
+        clouds = self._clouds
+        clouds.begin_step()
+        clouds.live("y")[:] -= clouds.live("speed") * delta_time
+
+        collected = clouds.colliding(self._player.rect)
+        self._total_cloud_points += int(
+            self._cloud_points[clouds.live("kind")[collected]].sum()
+        )
+        clouds.remove(collected | (clouds.bottoms() < 0))
+
+    async def _cull_helicopters(self):
+        """
+        Remove helicopters that have left the top of the screen, or have finished
+        fading out after exploding.
+        """
+
+        helis = self._helicopters
+        helis.remove(
+            (helis.bottoms() < 0)
+            | (helis.live("exploded") & (helis.live("opacity") <= 0))
+        )
+
+    async def _handle_helicopter_movement(self, delta_time):
+        """
+        Move helicopters, bouncing them off the sides of the screen as in
+        `Helicopter.move`, and see if they have collided with either the player or
+        with each other, causing them to explode.
+        """
+
+        helis = self._helicopters
+        helis.begin_step()
+
+        x = helis.live("x")
+        exploded = helis.live("exploded")
+        flying = ~exploded
+        direction = helis.live("direction")
+        turn_timer = helis.live("turn_timer")
+        turn_timer += delta_time
+
+        # Flying helicopters climb and drift sideways, and exploded ones climb
+        # slowly while fading out
+        helis.live("y")[:] -= np.where(flying, helis.live("speed"), 200) * delta_time
+        drift = np.where(flying, helis.live("horizontal_speed") * direction, 0)
+        x += drift * delta_time
+        opacity = helis.live("opacity")
+        opacity[exploded] = np.maximum(0, opacity[exploded] - 51 * delta_time)
+
+        # Turn around at the sides of the screen, at most once a second
+        turning = (
+            flying
+            & ((x <= 0) | (x + helis.live("width") >= game.screen_width))
+            & (turn_timer > 1)
+        )
+        direction[turning] *= -1
+        turn_timer[turning] = 0
+
+        # End the life if the player has flown into a helicopter
+        if helis.colliding(self._player.hitbox, flying).any():
+            self._score = (10 * self._time_survived) + self._total_cloud_points
+            await self.stop()
+            return
+
+        # Explode any helicopters that have collided with each other
+        first, second = helis.colliding_pairs(flying)
+        exploded[first] = True
+        exploded[second] = True
+
+    def _draw_clouds(self):
+        """
+        Draw the clouds in a single batch, returning the regions drawn.
+        """
+
+        clouds = self._clouds
+        sprites = [cloud_type["sprite"] for cloud_type in Cloud.cloud_types]
+        x, y = clouds.positions(game.alpha)
+        centers = zip(
+            (x + clouds.live("width") // 2).tolist(),
+            (y + clouds.live("height") // 2).tolist(),
+        )
+
+        blits = []
+        for kind, center in zip(clouds.live("kind").tolist(), centers):
+            sprite = sprites[kind]
+            blits.append((sprite, sprite.get_rect(center=center)))
+        return game.screen.blits(blits)
+
+    def _draw_helicopters(self):
+        """
+        Draw the helicopters in a single batch, using explosion artwork for those
+        that have exploded, returning the regions drawn.
+        """
+
+        helis = self._helicopters
+        x, y = helis.positions(game.alpha)
+        levels = np.rint(
+            helis.live("opacity") / 255 * (Helicopter.explosion_fade_levels - 1)
+        ).astype(int)
+
+        blits = []
+        for left, top, direction, exploded, level in zip(
+            x.tolist(),
+            y.tolist(),
+            helis.live("direction").tolist(),
+            helis.live("exploded").tolist(),
+            levels.tolist(),
+        ):
+            image = (
+                Helicopter.explosion_frames[level]
+                if exploded
+                else Helicopter.images[direction]
+            )
+            blits.append((image, (left, top)))
+        return game.screen.blits(blits)
+
+
+class FrameTime:
+    """
+    Snapshot of simulation time, advanced once per fixed step and passed to
+    entities, so that they don't each track the time or derive values from it.
+    """
+
+    __slots__ = ("delta_time", "elapsed", "seconds")
+
+    def __init__(self):
+        self.delta_time = 0
+        self.elapsed = 0
+        self.seconds = 0
+
+    def advance(self, delta_time):
+        """
+        Move time forward by one step of `delta_time` seconds.
+        """
+
+        self.delta_time = delta_time
+        self.elapsed += delta_time
+        self.seconds = int(self.elapsed)
+
+
+class InputState:
+    """
+    Compact table of the steering controls that are currently held, whether with
+    the keyboard or by touch. Any number of input events can be applied between
+    simulation steps, and the view simply queries the resulting state.
+    """
+
+    __slots__ = ("left", "right")
+
+    def __init__(self):
+        self.left = False
+        self.right = False
+
+    def handle(self, event):
+        """
+        Update the state of the controls from an input event.
         """
 
         # Handle keyboard controls
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_LEFT:
-                self._steer_left = True
+                self.left = True
             elif event.key == pygame.K_RIGHT:
-                self._steer_right = True
+                self.right = True
         elif event.type == pygame.KEYUP:
             if event.key == pygame.K_LEFT:
-                self._steer_left = False
+                self.left = False
             elif event.key == pygame.K_RIGHT:
-                self._steer_right = False
+                self.right = False
 
         # Handle touch controls
         elif event.type == pygame.FINGERDOWN:
-            # Check if the touch is on the left or right side of the screen
-            if event.x < 0.5:
-                self._steer_left = True
-                self._steer_right = False  # Prevent dual direction steering
-            else:
-                self._steer_right = True
-                self._steer_left = False  # Prevent dual direction steering
+            # Check if the touch is on the left or right side of the screen, and
+            # prevent dual direction steering
+            self.left = event.x < 0.5
+            self.right = not self.left
         elif event.type == pygame.FINGERUP:
             # Release steering when finger is lifted
-            self._steer_left = False
-            self._steer_right = False
+            self.left = False
+            self.right = False
 
-    async def get_results(self):
+
+class SpatialHash:
+    """
+    Uniform grid used as a broad phase for finding collisions between entities in
+    the same group, such as helicopters colliding with each other. Entities with a
+    `rect` are bucketed into every cell their rect overlaps, so that only entities
+    sharing a cell need to be tested against each other. Checks against a single
+    rect, such as the player's, use `Rect.collidelist` instead.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self._cells = {}
+
+    def _cell_keys(self, rect):
         """
-        Provide the results of the gaming session once it has concluded.
+        Yield the key of every grid cell overlapped by the supplied rect.
         """
 
-        return (
-            round((10 * self._time_survived) + self._total_cloud_points),
-            round(self._time_survived),
-            round(self._total_cloud_points),
-            round(self._max_speed),
+        size = self.cell_size
+        for cell_x in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cell_y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield cell_x, cell_y
+
+    def clear(self):
+        """
+        Remove all entities from the grid, ready for the next frame.
+        """
+
+        self._cells.clear()
+
+    def insert(self, entity):
+        """
+        Add an entity to every cell overlapped by its rect.
+        """
+
+        for key in self._cell_keys(entity.rect):
+            cell = self._cells.get(key)
+            if cell is None:
+                self._cells[key] = [entity]
+            else:
+                cell.append(entity)
+
+    def pairs(self):
+        """
+        Find all pairs of entities in the grid whose rects collide with each other.
+        Each pair is only reported once, even if it shares more than one cell.
+        """
+
+        seen = set()
+        for cell in self._cells.values():
+            for i in range(len(cell) - 1):
+                entity = cell[i]
+                for other in cell[i + 1 :]:
+                    key = (id(entity), id(other))
+                    if key in seen or (id(other), id(entity)) in seen:
+                        continue
+                    seen.add(key)
+                    if entity.rect.colliderect(other.rect):
+                        yield entity, other
+
+
+class Pool:
+    """
+    Recycles entity instances, so that spawning clouds and helicopters doesn't
+    allocate a new object each time. Pooled classes must provide a `reset` method
+    that accepts the same arguments as their constructor.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._free = []
+
+    def acquire(self, *args):
+        """
+        Fetch an entity from the pool, resetting it with the supplied arguments, or
+        create a new one if the pool is empty.
+        """
+
+        if self._free:
+            entity = self._free.pop()
+            entity.reset(*args)
+            return entity
+        return self._factory(*args)
+
+    def release(self, entity):
+        """
+        Return an entity to the pool once it is no longer on screen.
+        """
+
+        self._free.append(entity)
+
+
+class EntityStore:
+    """
+    Struct-of-arrays storage for obstacles, which keeps each attribute of every
+    live obstacle in its own NumPy array, so that they can be updated in vectorized
+    passes rather than one object at a time. Live obstacles are packed at the start
+    of each array, and removing obstacles compacts them. Rects are only built for
+    drawing. Requires NumPy.
+    """
+
+    # Attributes of each obstacle, and their array types
+    fields = {
+        "x": "f8",
+        "y": "f8",
+        "previous_x": "f8",
+        "previous_y": "f8",
+        "width": "i4",
+        "height": "i4",
+        "speed": "f8",
+        "horizontal_speed": "f8",
+        "direction": "i1",
+        "turn_timer": "f8",
+        "exploded": "?",
+        "opacity": "f8",
+        "kind": "i1",
+    }
+
+    def __init__(self, capacity=64):
+        if np is None:
+            raise RuntimeError("The vectorized entity store requires NumPy")
+
+        self.count = 0
+        self._arrays = {
+            name: np.zeros(capacity, dtype) for name, dtype in self.fields.items()
+        }
+
+    def __len__(self):
+        return self.count
+
+    def live(self, name):
+        """
+        View of the named attribute of every live obstacle. Writes to the view
+        update the store.
+        """
+
+        return self._arrays[name][: self.count]
+
+    def spawn(self, **values):
+        """
+        Add an obstacle with the supplied attributes, all others being zero,
+        growing the arrays as needed.
+        """
+
+        capacity = len(self._arrays["x"])
+        if self.count == capacity:
+            for name, array in self._arrays.items():
+                grown = np.zeros(capacity * 2, array.dtype)
+                grown[:capacity] = array
+                self._arrays[name] = grown
+
+        index = self.count
+        for name, array in self._arrays.items():
+            array[index] = values.get(name, 0)
+        self._arrays["previous_x"][index] = values.get("x", 0)
+        self._arrays["previous_y"][index] = values.get("y", 0)
+        self.count += 1
+
+    def remove(self, removed):
+        """
+        Remove the obstacles selected by a boolean array over the live obstacles.
+        """
+
+        if not removed.any():
+            return
+
+        kept = ~removed
+        remaining = int(kept.sum())
+        for array in self._arrays.values():
+            array[:remaining] = array[: self.count][kept]
+        self.count = remaining
+
+    def begin_step(self):
+        """
+        Remember the current positions before a simulation step moves them, for
+        interpolated drawing.
+        """
+
+        self.live("previous_x")[:] = self.live("x")
+        self.live("previous_y")[:] = self.live("y")
+
+    def bottoms(self):
+        """
+        Bottom edge of each live obstacle.
+        """
+
+        return self.live("y") + self.live("height")
+
+    def colliding(self, rect, candidates=None):
+        """
+        Find the live obstacles whose bounds overlap the supplied rect, optionally
+        limited to the candidates selected by a boolean array. Returns a boolean
+        array over the live obstacles.
+        """
+
+        x = self.live("x")
+        y = self.live("y")
+        hits = (
+            (x < rect.right)
+            & (x + self.live("width") > rect.left)
+            & (y < rect.bottom)
+            & (y + self.live("height") > rect.top)
         )
+        if candidates is not None:
+            hits &= candidates
+        return hits
+
+    def colliding_pairs(self, candidates):
+        """
+        Find every pair of candidates, selected by a boolean array, whose bounds
+        overlap each other. Returns two arrays of live obstacle indexes, holding the
+        first and second obstacle of each pair.
+
+        Candidates are swept from left to right, so that only those whose
+        horizontal spans overlap are compared, rather than every pair.
+        """
+
+        indexes = np.flatnonzero(candidates)
+        order = np.argsort(self.live("x")[indexes], kind="stable")
+        indexes = indexes[order]
+        left = self.live("x")[indexes]
+        top = self.live("y")[indexes]
+        right = left + self.live("width")[indexes]
+        bottom = top + self.live("height")[indexes]
+
+        # Each candidate overlaps horizontally with the candidates after it in the
+        # sweep that start before it ends
+        count = len(indexes)
+        ends = np.searchsorted(left, right, side="left")
+        spans = np.maximum(ends - np.arange(count) - 1, 0)
+        first = np.repeat(np.arange(count), spans)
+        starts = np.repeat(np.cumsum(spans) - spans, spans)
+        second = first + 1 + np.arange(len(first)) - starts
+
+        overlaps = (top[first] < bottom[second]) & (bottom[first] > top[second])
+        return indexes[first[overlaps]], indexes[second[overlaps]]
+
+    def positions(self, alpha=1):
+        """
+        Whole pixel positions of the live obstacles, interpolated between their
+        previous and current positions for drawing.
+        """
+
+        x = self.live("x")
+        y = self.live("y")
+        if alpha < 1:
+            previous_x = self.live("previous_x")
+            previous_y = self.live("previous_y")
+            x = previous_x + (x - previous_x) * alpha
+            y = previous_y + (y - previous_y) * alpha
+        return x.astype(int), y.astype(int)
+
+
+class RotationCache:
+    """
+    Copies of an image pre-rotated at evenly spaced angles, so that tilting a
+    sprite is a lookup rather than a rotation on every frame. Angles are quantized
+    to the nearest step.
+    """
+
+    def __init__(self, name, size, max_angle, step):
+        self.step = step
+        self.max_index = round(max_angle / step)
+        self._frames = []
+        for index in range(-self.max_index, self.max_index + 1):
+            self._frames.append(game.image_variant(name, size=size, angle=index * step))
+
+    def get(self, angle):
+        """
+        Fetch the pre-rotated image closest to the supplied angle.
+        """
+
+        index = max(-self.max_index, min(self.max_index, round(angle / self.step)))
+        return self._frames[index + self.max_index]
 
 
 class Player:
     """
     Represents the skydiver that the player is controlling. Supports movement and
     "tilting" in the direction of movement, with acceleration and deceleration
-    for realistic steering. Movement speed increases over time.
+    for realistic steering. Movement speed increases over time. Velocities are
+    applied once per fixed simulation step.
     """
 
+    __slots__ = (
+        "seconds",
+        "image",
+        "rect",
+        "hitbox",
+        "previous",
+        "move_speed",
+        "angle",
+    )
+
+    base_max_speed = 10  # Initial max speed
+    base_move_delta = 0.2
+    max_angle = 15
+    angle_delta = 0.6
+
+    # Pre-rotated skydiver images, and the difficulty curves for steering, indexed
+    # by whole seconds of game time, shared by all players and built on first use
+    rotations = None
+    max_speeds = None
+    move_deltas = None
+
     def __init__(self):
-        self.start_time = pygame.time.get_ticks()
-        self.image = pygame.transform.scale(game.images.player, (100, 91))
+        self.seconds = 0
+        self.image = game.images.player_sprite
         self.rect = self.image.get_rect(
             center=(game.screen_width // 2, game.screen_height // 3)
         )
+        self.previous = self.rect.topleft
 
-        self.move_speed = 0
-        self.base_max_speed = 10  # Initial max speed
-        self.base_move_delta = 0.2
-
-        self.angle = 0
-        self.max_angle = 15
-        self.angle_delta = 0.6
-
-    @property
-    def hitbox(self):
-        return pygame.Rect(
+        # The region that collides with helicopters, which follows the player
+        self.hitbox = pygame.Rect(
             self.rect.x + 10,
             self.rect.y + 40,
             self.rect.width - 20,
             self.rect.height - 40,
         )
 
+        self.move_speed = 0
+        self.angle = 0
+
+        if Player.rotations is None:
+            Player.rotations = RotationCache(
+                "player_sprite", None, self.max_angle, self.angle_delta
+            )
+            Player.max_speeds, Player.move_deltas = self._difficulty_curves()
+
+    @classmethod
+    def _difficulty_curves(cls):
+        """
+        Calculate the max speed and max move delta for each whole second of game
+        time, up to the time limit.
+        """
+
+        max_speeds = []
+        move_deltas = []
+        for seconds in range(game.time_limit + 1):
+            # Increase speed every 10 seconds, capped at +10
+            max_speeds.append(cls.base_max_speed + min(seconds // 10, 10))
+            move_deltas.append(min(cls.base_move_delta + (0.025 * seconds), 5))
+        return max_speeds, move_deltas
+
     @property
     def max_speed(self):
         """
-        Dynamically calculate the max speed based on the elapsed game time.
+        Look up the max speed for the elapsed game time.
         """
-        elapsed_time = (pygame.time.get_ticks() - self.start_time) // 1000
-        speed_increase = min(
-            elapsed_time // 10, 10
-        )  # Increase speed every 10 seconds, capped at +5
-        return self.base_max_speed + speed_increase
+        return self.max_speeds[min(self.seconds, game.time_limit)]
 
     @property
     def move_delta(self):
         """
-        Dynamically calculate the max move delta based on the elapsed game time.
+        Look up the max move delta for the elapsed game time.
         """
-        elapsed_time = (pygame.time.get_ticks() - self.start_time) // 1000
-
-        delta = self.base_move_delta + (0.025 * elapsed_time)
-        delta = min(delta, 5)
+        return self.move_deltas[min(self.seconds, game.time_limit)]
 
-        return delta
-
-    def move(self, direction):
+    def move(self, direction, frame):
         """
         Adjust the skydiver's velocity and angle based on the input direction,
         respecting screen boundaries.
         """
+        self.seconds = frame.seconds
+        self.previous = self.rect.topleft
+
         # Moving right
         if direction > 0:
             if self.rect.x < game.screen_width - self.rect.width:
@@ -1232,25 +2431,37 @@ class Player:
             self.rect.x = game.screen_width - self.rect.width
             self.move_speed = min(0, self.move_speed)  # Prevent rightward velocity
 
-    def handle_movement(self, keys):
-        """
-        Map key presses to movement directions.
-        """
-        if keys.get(pygame.K_LEFT):
-            self.move(-1)
-        elif keys.get(pygame.K_RIGHT):
-            self.move(1)
-        else:
-            self.move(0)  # Gradually decelerate when no keys are pressed
+        self.hitbox.x = self.rect.x + 10
 
-    def draw(self):
+    def blit_args(self):
         """
-        Draw the player on the screen with the correct rotation.
+        The image of the player with the correct rotation, and where to draw it.
         """
-        # Rotate the image based on the current rotation angle
-        rotated_image = pygame.transform.rotate(self.image, self.angle)
-        rotated_rect = rotated_image.get_rect(center=self.rect.center)
-        game.screen.blit(rotated_image, rotated_rect)
+        # Look up the image pre-rotated to the current rotation angle
+        rect = game.interpolate_rect(self.rect, self.previous)
+        rotated_image = self.rotations.get(self.angle)
+        return rotated_image, rotated_image.get_rect(center=rect.center)
+
+
+def _label_cloud(image, points, color):
+    """
+    Bake a cloud's point value into a copy of its artwork once at load time, rather
+    than loading a font and rendering the label on every frame. The label is sized
+    based upon the height of the artwork, and may overhang it vertically, so the
+    sprite is sized to fit both.
+    """
+
+    font = game.get_font("fonts/common.otf", image.get_height())
+    label = font.render(str(points), True, color)
+
+    width = max(image.get_width(), label.get_width())
+    height = max(image.get_height(), label.get_height())
+    sprite = pygame.Surface((width, height), pygame.SRCALPHA).convert_alpha()
+
+    center = sprite.get_rect().center
+    sprite.blit(image, image.get_rect(center=center))
+    sprite.blit(label, label.get_rect(center=center))
+    return sprite
 
 
 class Cloud:
@@ -1260,47 +2471,66 @@ class Cloud:
     """
 
     cloud_types = [
-        {"image": game.images.cloud_a, "points": 1},
-        {"image": game.images.cloud_b, "points": 5},
-        {"image": game.images.cloud_c, "points": 10},
+        {"image": game.images.cloud_a, "points": 1, "color": game.colors.blue},
+        {"image": game.images.cloud_b, "points": 5, "color": game.colors.green},
+        {"image": game.images.cloud_c, "points": 10, "color": game.colors.red},
     ]
 
+    # Pre-render the point value label into each type of cloud
+    for _cloud_type in cloud_types:
+        _cloud_type["sprite"] = _label_cloud(
+            _cloud_type["image"], _cloud_type["points"], _cloud_type["color"]
+        )
+    del _cloud_type
+
+    __slots__ = ("rect", "image", "sprite", "previous", "speed", "point_value")
+
     def __init__(self, cloud_type, speed):
-        self.image = self.cloud_types[cloud_type]["image"]
-        self.rect = self.image.get_rect()
-        self.rect.x = random.randint(0, game.screen_width - self.rect.width)
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(cloud_type, speed)
+
+    def reset(self, cloud_type, speed):
+        """
+        (Re)initialize the cloud at the bottom of the screen, allowing instances to
+        be recycled.
+        """
+
+        cloud_type = self.cloud_types[cloud_type]
+        self.image = cloud_type["image"]
+        self.sprite = cloud_type["sprite"]
+        self.rect.size = self.image.get_size()
+        self.rect.x = game.rng.obstacles.randint(
+            0, game.screen_width - self.rect.width
+        )
         self.rect.y = game.screen_height
+        self.previous = self.rect.topleft
         self.speed = speed
-        self.point_value = self.cloud_types[cloud_type]["points"]
+        self.point_value = cloud_type["points"]
 
-        # Set the text color based on point value
-        self.text_color = {
-            1: game.colors.blue,
-            5: game.colors.green,
-            10: game.colors.red,
-        }[self.point_value]
+    @property
+    def expired(self):
+        """
+        Clouds expire once they have floated off the top of the screen.
+        """
 
-    def move(self, delta_time):
+        return self.rect.bottom < 0
+
+    def move(self, frame):
         """
         Move the cloud vertically
         """
 
-        self.rect.y -= self.speed * delta_time
+        self.previous = self.rect.topleft
+        self.rect.y -= self.speed * frame.delta_time
 
-    def draw(self):
+    def blit_args(self):
         """
-        Draw the cloud along with its point value and the appropriate image.
+        The pre-labeled sprite showing the cloud along with its point value, and
+        where to draw it.
         """
 
-        # Draw the image
-        game.screen.blit(self.image, self.rect)
-
-        # Calculate the font size based upon the height of the artwork
-        font_size = self.rect.height
-        font = pygame.font.Font(resource("fonts/common.otf"), font_size)
-        point_text = font.render(str(self.point_value), True, self.text_color)
-        point_rect = point_text.get_rect(center=self.rect.center)
-        game.screen.blit(point_text, point_rect)
+        rect = game.interpolate_rect(self.rect, self.previous)
+        return self.sprite, self.sprite.get_rect(center=rect.center)
 
 
 class BackgroundCloud(Cloud):
@@ -1308,8 +2538,10 @@ class BackgroundCloud(Cloud):
     A special type of cloud that doesn't have point values. Used on the title screen.
     """
 
-    def draw(self):
-        game.screen.blit(self.image, self.rect)
+    __slots__ = ()
+
+    def blit_args(self):
+        return self.image, self.rect
 
 
 class Helicopter:
@@ -1318,51 +2550,98 @@ class Helicopter:
     and can explode when colliding with another helicopter.
     """
 
+    # Artwork for each direction of movement, and the explosion at evenly spaced
+    # levels of opacity as it fades out, so that drawing is just a lookup
+    images = {
+        -1: game.images.helicopter,
+        1: game.image_variant("helicopter", flip_x=True),
+    }
+    explosion_fade_levels = 32
+    explosion_frames = []
+    for _level in range(explosion_fade_levels):
+        _alpha = round(255 * _level / (explosion_fade_levels - 1))
+        explosion_frames.append(game.image_variant("explosion", alpha=_alpha))
+    del _level, _alpha
+
+    __slots__ = (
+        "rect",
+        "previous",
+        "time_since_direction_change",
+        "speed",
+        "horizontal_speed",
+        "direction",
+        "exploded",
+        "opacity",
+    )
+
     def __init__(self, speed):
         self.rect = game.images.helicopter.get_rect()
-        self.rect.x = random.randint(0, game.screen_width - self.rect.width)
+        self.reset(speed)
+
+    def reset(self, speed):
+        """
+        (Re)initialize the helicopter at the bottom of the screen, allowing
+        instances to be recycled.
+        """
+
+        self.rect.size = game.images.helicopter.get_size()
+        self.rect.x = game.rng.obstacles.randint(
+            0, game.screen_width - self.rect.width
+        )
         self.rect.y = game.screen_height
-        self.last_direction_change = 1000
+        self.previous = self.rect.topleft
+        self.time_since_direction_change = 1
         self.speed = speed
-        self.horizontal_speed = random.uniform(40, 120)
-        self.direction = random.choice([-1, 1])
+        self.horizontal_speed = game.rng.obstacles.uniform(40, 120)
+        self.direction = game.rng.obstacles.choice([-1, 1])
         self.exploded = False
         self.opacity = 255
 
-    def move(self, delta_time):
+    @property
+    def expired(self):
+        """
+        Helicopters expire once they have flown off the top of the screen, or have
+        completely faded out after exploding.
+        """
+
+        return self.rect.bottom < 0 or (self.exploded and self.opacity <= 0)
+
+    def move(self, frame):
         """
         Move the helicopter, unless the helicopter has exploded, in which case,
         slowly fade out of the display.
         """
 
+        delta_time = frame.delta_time
+
+        self.previous = self.rect.topleft
+        self.time_since_direction_change += delta_time
+
         if not self.exploded:
             self.rect.y -= self.speed * delta_time
             self.rect.x += self.horizontal_speed * delta_time * self.direction
             if self.rect.left <= 0 or self.rect.right >= game.screen_width:
-                if (pygame.time.get_ticks() - self.last_direction_change) > 1000:
+                if self.time_since_direction_change > 1:
                     self.direction *= -1
-                    self.last_direction_change = pygame.time.get_ticks()
+                    self.time_since_direction_change = 0
         else:
             self.rect.y -= 200 * delta_time
             self.opacity = max(0, self.opacity - 51 * delta_time)
 
-    def draw(self):
+    def blit_args(self):
         """
-        Draw the helicopter. Will render the helicopter image in the orientation of
-        movement, and will use explosion artwork if the helicopter has collided with
-        another.
+        The image of the helicopter, and where to draw it. Uses the helicopter image
+        in the orientation of movement, or explosion artwork if the helicopter has
+        collided with another.
         """
 
+        rect = game.interpolate_rect(self.rect, self.previous)
+
         if self.exploded:
-            game.images.explosion.set_alpha(int(self.opacity))
-            game.screen.blit(game.images.explosion, self.rect)
+            level = round(self.opacity / 255 * (self.explosion_fade_levels - 1))
+            return self.explosion_frames[level], rect
         else:
-            image_to_draw = (
-                game.images.helicopter
-                if self.direction == -1
-                else pygame.transform.flip(game.images.helicopter, True, False)
-            )
-            game.screen.blit(image_to_draw, self.rect)
+            return self.images[self.direction], rect
 
 
 class Leaderboard:
@@ -1466,4 +2745,4 @@ class Leaderboard:
 
 
 if __name__ == "__main__":
-    asyncio.run(game.show_title())
+    asyncio.run(game.run())
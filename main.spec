@@ -7,7 +7,7 @@ a = Analysis(
     binaries=[],
     datas=[
       ("fonts", "fonts"),
-      ("images", "images"),
+      ("assets", "assets"),
       ("results.sql", ".")
     ],
     hiddenimports=["pdb"],
@@ -0,0 +1,243 @@
+import gc
+import json
+import time
+import tracemalloc
+from collections import deque
+
+
+class _Stage:
+    """
+    Reusable context manager that times a single named stage of a frame.
+    """
+
+    __slots__ = ("_profiler", "_name", "_start")
+
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+        self._start = 0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._profiler.record(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class Profiler:
+    """
+    Lightweight per-stage frame timer. Each stage keeps a ring buffer of its most
+    recent durations, from which percentiles can be calculated on demand.
+    """
+
+    def __init__(self, history=300):
+        self.history = history
+        self._samples = {}
+        self._stages = {}
+        self._counts = {}
+
+    def measure(self, name):
+        """
+        Context manager that times the enclosed block as the named stage.
+        """
+
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = self._stages[name] = _Stage(self, name)
+        return stage
+
+    def record(self, name, seconds):
+        """
+        Record a duration, in seconds, for the named stage.
+        """
+
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples[name] = deque(maxlen=self.history)
+        samples.append(seconds)
+
+    def record_count(self, name, count):
+        """
+        Record a per-frame count, such as a number of allocations, for the named
+        counter. Counters are summarized separately from stage durations.
+        """
+
+        counts = self._counts.get(name)
+        if counts is None:
+            counts = self._counts[name] = deque(maxlen=self.history)
+        counts.append(count)
+
+    def stats(self):
+        """
+        Summarize the recorded history of each stage, in milliseconds.
+        """
+
+        summary = {}
+        for name, samples in self._samples.items():
+            if not samples:
+                continue
+
+            ordered = sorted(samples)
+            summary[name] = {
+                "samples": len(ordered),
+                "mean": sum(ordered) / len(ordered) * 1000,
+                "p50": self._percentile(ordered, 50) * 1000,
+                "p95": self._percentile(ordered, 95) * 1000,
+                "p99": self._percentile(ordered, 99) * 1000,
+                "max": ordered[-1] * 1000,
+            }
+        return summary
+
+    def count_stats(self):
+        """
+        Summarize the recorded history of each counter.
+        """
+
+        summary = {}
+        for name, counts in self._counts.items():
+            if not counts:
+                continue
+
+            ordered = sorted(counts)
+            summary[name] = {
+                "samples": len(ordered),
+                "mean": sum(ordered) / len(ordered),
+                "p50": self._percentile(ordered, 50),
+                "p95": self._percentile(ordered, 95),
+                "p99": self._percentile(ordered, 99),
+                "max": ordered[-1],
+            }
+        return summary
+
+    def dump(self, path, extra=None):
+        """
+        Write the summarized stats, along with the raw history of each stage and
+        counter, and any extra data supplied, to a JSON file.
+        """
+
+        data = {
+            "timestamp": time.time(),
+            "stats": self.stats(),
+            "counts": self.count_stats(),
+            "history": {
+                name: [seconds * 1000 for seconds in samples]
+                for name, samples in self._samples.items()
+            },
+            "count_history": {
+                name: list(counts) for name, counts in self._counts.items()
+            },
+            **(extra or {}),
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+    def reset(self):
+        """
+        Discard all recorded history.
+        """
+
+        self._samples.clear()
+        self._counts.clear()
+
+    @staticmethod
+    def _percentile(ordered, percent):
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        return ordered[index]
+
+
+class GCMonitor:
+    """
+    Reports garbage collector activity to a `Profiler`. The pause caused by each
+    collection is recorded as a `gc.gen<N>` stage, using `gc.callbacks`, and the
+    net number of objects tracked by the collector that were allocated during each
+    frame as the `alloc.objects` counter. Optionally, allocations are also traced
+    with tracemalloc, which is much more expensive, recording the net KiB allocated
+    during each frame as `alloc.kib`, and the sites responsible for the most
+    memory allocated since tracing began.
+    """
+
+    def __init__(self, profiler, trace_allocations=False):
+        self.profiler = profiler
+        self.trace_allocations = trace_allocations
+        self._collection_started = 0
+        self._allocated = 0
+        self._pending = 0
+        self._traced = 0
+        self._baseline = None
+
+    def start(self):
+        """
+        Begin monitoring collections, and tracing allocations if enabled.
+        """
+
+        if self._on_collection not in gc.callbacks:
+            gc.callbacks.append(self._on_collection)
+        self._pending = gc.get_count()[0]
+
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._baseline = tracemalloc.take_snapshot()
+            self._traced = tracemalloc.get_traced_memory()[0]
+
+    def stop(self):
+        """
+        Stop monitoring collections and tracing allocations.
+        """
+
+        if self._on_collection in gc.callbacks:
+            gc.callbacks.remove(self._on_collection)
+        if self._baseline is not None:
+            tracemalloc.stop()
+            self._baseline = None
+
+    def end_frame(self):
+        """
+        Record the allocations made since the end of the previous frame.
+        """
+
+        pending = gc.get_count()[0]
+        self.profiler.record_count(
+            "alloc.objects", self._allocated + pending - self._pending
+        )
+        self._allocated = 0
+        self._pending = pending
+
+        if self._baseline is not None:
+            traced = tracemalloc.get_traced_memory()[0]
+            self.profiler.record_count("alloc.kib", (traced - self._traced) / 1024)
+            self._traced = traced
+
+    def allocation_sites(self, limit=20):
+        """
+        Summarize the source lines that have allocated the most memory since tracing
+        began, or an empty list if allocations aren't being traced.
+        """
+
+        if self._baseline is None:
+            return []
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+        return [
+            {
+                "site": str(stat.traceback),
+                "kib": stat.size_diff / 1024,
+                "blocks": stat.count_diff,
+            }
+            for stat in snapshot.compare_to(self._baseline, "lineno")[:limit]
+        ]
+
+    def _on_collection(self, phase, info):
+        if phase == "start":
+            # The collection resets the count of allocations since the last one
+            self._allocated += gc.get_count()[0] - self._pending
+            self._pending = 0
+            self._collection_started = time.perf_counter()
+        else:
+            self.profiler.record(
+                f"gc.gen{info['generation']}",
+                time.perf_counter() - self._collection_started,
+            )
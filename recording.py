@@ -0,0 +1,116 @@
+import atexit
+import struct
+
+# Recordings start with a small header, followed by fixed-size records. Each record
+# holds the simulation step and pygame ticks at which it was captured, the kind of
+# record, and its payload: a key code, or touch coordinates.
+MAGIC = b"SKYR"
+VERSION = 1
+HEADER = struct.Struct("<4sB")
+RECORD = struct.Struct("<IIBiff")
+
+# Kinds of records. A `LIFE` record marks the start of a life, and carries the seed
+# used for that life's random number generators in place of a key code.
+LIFE = 0
+KEYDOWN = 1
+KEYUP = 2
+FINGERDOWN = 3
+FINGERUP = 4
+
+
+class Recorder:
+    """
+    Captures the seed and input events for each life played, into a compact binary
+    file that can be replayed deterministically with `Replay`.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION))
+        atexit.register(self.close)
+
+    def start_life(self, seed, ticks=0):
+        """
+        Mark the start of a new life, played with the supplied seed.
+        """
+
+        self._write(0, ticks, LIFE, seed, 0, 0)
+        self._file.flush()
+
+    def record(self, step, ticks, kind, key=0, x=0.0, y=0.0):
+        """
+        Record an input event, which was handled before the supplied simulation
+        step of the current life.
+        """
+
+        self._write(step, ticks, kind, key, x, y)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def _write(self, *record):
+        if not self._file.closed:
+            self._file.write(RECORD.pack(*record))
+
+
+class ReplayLife:
+    """
+    The seed and input events for a single recorded life, indexed by the simulation
+    step that they need to be handled before.
+    """
+
+    def __init__(self, seed):
+        self.seed = seed
+        self.events = {}
+        self.last_step = 0
+
+    def add(self, step, kind, key, x, y):
+        self.events.setdefault(step, []).append((kind, key, x, y))
+        self.last_step = max(self.last_step, step)
+
+    def events_for(self, step):
+        """
+        Fetch the events that were handled before the supplied simulation step.
+        """
+
+        return self.events.get(step, ())
+
+
+class Replay:
+    """
+    Loads a recording made by `Recorder`, and hands out its lives in order.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+
+        magic, version = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a Skyfall recording")
+
+        # Ignore any partially written record at the end of the file
+        body = data[HEADER.size :]
+        body = body[: len(body) - len(body) % RECORD.size]
+
+        self.lives = []
+        for step, _, kind, key, x, y in RECORD.iter_unpack(body):
+            if kind == LIFE:
+                self.lives.append(ReplayLife(key))
+            elif self.lives:
+                self.lives[-1].add(step, kind, key, x, y)
+
+        self._next = 0
+
+    def next_life(self):
+        """
+        Fetch the next recorded life, or `None` once all lives have been replayed.
+        """
+
+        if self._next >= len(self.lives):
+            return None
+
+        life = self.lives[self._next]
+        self._next += 1
+        return life
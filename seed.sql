@@ -1,6 +1,12 @@
 -- Drop the existing tables if they exist
 DROP TABLE IF EXISTS players;
 DROP TABLE IF EXISTS sessions;
+DROP TABLE IF EXISTS scores;
+DROP TABLE IF EXISTS sync_nodes;
+DROP TABLE IF EXISTS meta;
+
+-- Reset the schema version so the game re-applies its migrations on next launch
+PRAGMA user_version = 0;
 
 -- Recreate the players table
 CREATE TABLE players (
@@ -0,0 +1,234 @@
+import os
+import sys
+import hmac
+import json
+import time
+import sqlite3
+import argparse
+import threading
+import urllib.parse
+import urllib.request
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+import leaderboard
+
+# Number of sessions pulled from a node per request, and merged per transaction
+BATCH_SIZE = 500
+
+# Default address and port for serving this kiosk's sessions to other kiosks over
+# HTTP. Only this machine can connect unless another address is chosen.
+DEFAULT_BIND = "127.0.0.1"
+DEFAULT_PORT = 8754
+
+# Shared secret that sync servers require, and that pulls send, as a bearer token
+SYNC_TOKEN = os.environ.get("SKYFALL_SYNC_TOKEN")
+
+# How often, in seconds, the game pulls new sessions from other kiosks
+SYNC_INTERVAL = 60.0
+
+# Seconds to wait for another kiosk to respond before giving up until the next pull
+HTTP_TIMEOUT = 5.0
+
+
+# Function to turn a source (a database file path, or the URL of another kiosk's
+# sync server) into the name its high-water mark is stored under
+def node_name(source):
+    if source.startswith(("http://", "https://")):
+        return source.rstrip("/")
+    return os.path.abspath(source)
+
+
+# Function to fetch sessions added to a source after the supplied row ID. Returns
+# the source's database ID and the row ID of its last session, as described by
+# `leaderboard.describe_database`, along with the sessions.
+def fetch_sessions(source, after, count=BATCH_SIZE, token=SYNC_TOKEN):
+    if source.startswith(("http://", "https://")):
+        query = urllib.parse.urlencode({"after": after, "count": count})
+        request = urllib.request.Request(f"{source.rstrip('/')}/sessions?{query}")
+        if token:
+            request.add_header("Authorization", f"Bearer {token}")
+        with urllib.request.urlopen(request, timeout=HTTP_TIMEOUT) as response:
+            data = json.load(response)
+        rows = [tuple(row) for row in data["sessions"]]
+        return data["database_id"], data["last_row"], rows
+
+    # Database files are offline copies of other kiosks' databases, such as ones
+    # carried over on a USB drive. WAL relies on shared memory, which doesn't work
+    # across machines or network filesystems, so live kiosks are pulled from over
+    # HTTP instead. The copies are opened read-only and as immutable, so that SQLite
+    # doesn't try to lock them or recover a journal.
+    path = urllib.parse.quote(os.path.abspath(source))
+    uri = f"file:{path}?mode=ro&immutable=1"
+    conn = sqlite3.connect(uri, uri=True)
+    try:
+        database_id, last_row = leaderboard.describe_database(conn)
+        rows = leaderboard.export_sessions(after, count, conn=conn)
+        return database_id, last_row, rows
+    finally:
+        conn.close()
+
+
+# Function to merge every session added to a source since it was last pulled from,
+# in batches. Returns the number of new sessions.
+def pull(source, token=SYNC_TOKEN):
+    node = node_name(source)
+    if node == os.path.abspath(leaderboard.DATABASE_FILE):
+        return 0
+
+    merged = 0
+    high_water, known_id = leaderboard.get_high_water(node)
+    database_id, last_row, rows = fetch_sessions(source, high_water, token=token)
+
+    # If the source's database has been replaced, such as by reseeding it, its row
+    # IDs have started over, so pull everything again. Sessions that were already
+    # merged are skipped.
+    if database_id != known_id or last_row < high_water:
+        high_water = 0
+        database_id, last_row, rows = fetch_sessions(source, 0, token=token)
+
+    while True:
+        merged += leaderboard.merge_sessions(node, rows, database_id)
+        if len(rows) < BATCH_SIZE:
+            return merged
+        high_water = rows[-1][0]
+        _, _, rows = fetch_sessions(source, high_water, token=token)
+
+
+# Function to pull from each source in turn, reporting, rather than raising, any
+# sources that can't be reached. Returns the number of new sessions.
+def pull_all(sources, token=SYNC_TOKEN):
+    merged = 0
+    for source in sources:
+        try:
+            merged += pull(source, token)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            print(f"Unable to sync from {source}: {e}", file=sys.stderr)
+    return merged
+
+
+# Function to start a daemon thread which pulls from each source periodically. The
+# leaderboard notices the new sessions through its cache's change detection.
+def start_background_sync(sources, interval=SYNC_INTERVAL, token=SYNC_TOKEN):
+    def sync_loop():
+        while True:
+            pull_all(sources, token)
+            time.sleep(interval)
+
+    thread = threading.Thread(target=sync_loop, name="leaderboard-sync", daemon=True)
+    thread.start()
+    return thread
+
+
+class SessionsHandler(BaseHTTPRequestHandler):
+    """
+    Serves this kiosk's sessions to other kiosks, as a stand-in for a central
+    leaderboard service. `GET /sessions?after=<row id>&count=<n>` responds with the
+    rows from `leaderboard.export_sessions`, and the database ID and last row ID
+    from `leaderboard.describe_database`, as JSON. Sessions include players'
+    email addresses, so when a token is set, requests must present it.
+    """
+
+    token = None
+
+    def do_GET(self):
+        if self.token is not None:
+            supplied = self.headers.get("Authorization", "")
+            if not hmac.compare_digest(supplied, f"Bearer {self.token}"):
+                self.send_error(401)
+                return
+
+        url = urllib.parse.urlparse(self.path)
+        if url.path != "/sessions":
+            self.send_error(404)
+            return
+
+        query = urllib.parse.parse_qs(url.query)
+        try:
+            after = int(query.get("after", ["0"])[0])
+            count = int(query.get("count", [BATCH_SIZE])[0])
+        except ValueError:
+            self.send_error(400)
+            return
+        if after < 0:
+            self.send_error(400)
+            return
+
+        # SQLite treats a negative limit as no limit at all, so always send between
+        # one and a full batch of sessions
+        count = max(1, min(count, BATCH_SIZE))
+
+        database_id, last_row = leaderboard.describe_database()
+        body = json.dumps(
+            {
+                "database_id": database_id,
+                "last_row": last_row,
+                "sessions": leaderboard.export_sessions(after, count),
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Merge the leaderboards of several Skyfall kiosks."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    pull_parser = commands.add_parser(
+        "pull", help="merge new sessions from other kiosks into this leaderboard"
+    )
+    pull_parser.add_argument(
+        "--token",
+        default=SYNC_TOKEN,
+        help="token to present to sync servers (default: $SKYFALL_SYNC_TOKEN)",
+    )
+    pull_parser.add_argument(
+        "sources",
+        nargs="+",
+        metavar="SOURCE",
+        help="URL of another kiosk's sync server, or an offline copy of its database",
+    )
+
+    serve_parser = commands.add_parser(
+        "serve", help="serve this kiosk's sessions to other kiosks over HTTP"
+    )
+    serve_parser.add_argument(
+        "--bind",
+        default=DEFAULT_BIND,
+        help=f"address to listen on (default: {DEFAULT_BIND}, this machine only)",
+    )
+    serve_parser.add_argument(
+        "--port", type=int, default=DEFAULT_PORT, help="port to listen on"
+    )
+    serve_parser.add_argument(
+        "--token",
+        default=SYNC_TOKEN,
+        help="token that requests must present (default: $SKYFALL_SYNC_TOKEN)",
+    )
+
+    args = parser.parse_args()
+
+    # Sessions include email addresses, so never serve them to other machines
+    # without a token
+    if args.command == "serve" and not args.token:
+        if args.bind not in ("127.0.0.1", "localhost", "::1"):
+            parser.error("--token is required when serving beyond this machine")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "pull":
+        print(f"Merged {pull_all(args.sources, args.token)} new sessions")
+    else:
+        SessionsHandler.token = args.token or None
+        server = HTTPServer((args.bind, args.port), SessionsHandler)
+        print(f"Serving sessions on {args.bind}:{args.port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass